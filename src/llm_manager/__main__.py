@@ -1,6 +1,8 @@
-"""Entry point for ``python -m llm_manager`` (and the .bat launcher)."""
+"""Entry point for ``python -m llm_manager`` (and the .bat launcher).
 
-from llm_manager.app import main
+parent 仅导入轻量 launcher;应用栈在 worker 分支内按需导入。"""
+
+from llm_manager.launcher import main
 
 if __name__ == "__main__":
     main()
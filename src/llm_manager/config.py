@@ -117,6 +117,17 @@ class AppConfig:
     models: dict[str, ModelConfig]
     wol: WakeOnLanConfig | None
     claude_configs: dict[str, dict[str, str]]
+    # resolve_alias 的 alias→primary 索引:随快照构造一次(replace 出新快照即重建),
+    # 无模块级缓存、无需失效。按模型顺序首个命中优先(与线性扫描一致)。
+    _alias_index: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        index: dict[str, str] = {}
+        for name, m in self.models.items():
+            index.setdefault(name, name)
+            for a in m.aliases:
+                index.setdefault(a, name)
+        object.__setattr__(self, "_alias_index", index)
 
 
 def load(path: Path) -> AppConfig:
@@ -243,10 +254,11 @@ def referenced_devices(cfg: AppConfig) -> set[str]:
 
 
 def resolve_alias(cfg: AppConfig, alias: str) -> str:
-    for name, m in cfg.models.items():
-        if alias == name or alias in m.aliases:
-            return name
-    raise KeyError(alias)
+    # 非 str(JSON 里的列表等)不可哈希
+    name = cfg._alias_index.get(alias) if isinstance(alias, str) else None
+    if name is None:
+        raise KeyError(alias)
+    return name
 
 
 def auto_start_models(cfg: AppConfig) -> list[str]:
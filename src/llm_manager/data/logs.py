@@ -65,7 +65,7 @@ class _Session:
     id: int
     type: str
     model_name: str | None
-    bc: Broadcaster[LogLine]
+    bc: Broadcaster[tuple[LogLine, ...]]  # 每次 flush 整批一条(订阅队列不被逐行挤满丢行)
     next_seq: int = 1
 
 
@@ -215,7 +215,7 @@ def _enqueue(session_id: int, text: str, stream: str, level: str, ts: float) ->
 
 
 async def flush() -> None:
-    """强制落库当前 pending(测试/关停用)。按 session 分组落库,落库后逐行广播(带 DB 全局 id)。
+    """强制落库当前 pending(测试/关停用)。按 session 分组落库,落库后整批广播(带 DB 全局 id)。
 
     并发 flush 严格串行(链式):先等链尾 flush 任务收尾、再自任新链尾——write_lock 非 FIFO,
     并行落库会把全局行 id 顺序打乱(与会话内 seq 脱节,backfill 呈现倒置历史),
@@ -254,12 +254,16 @@ async def flush() -> None:
                 logger.warning("log flush: dropping dead session %d (insert failed: %s)", sid, e)
                 continue
             s = _sessions.get(sid)
-            if s is None:
+            if s is None or not s.bc.subscriber_count:
                 continue
-            for line, lid in zip(rows, ids):
-                s.bc.publish(
+            # 整批作一条广播:≤200 行的突发不再逐行占满订阅队列(maxsize 16,满则丢),
+            # 流端点也一次写出整批帧,而非每行一次 send
+            s.bc.publish(
+                tuple(
                     LogLine(id=lid, ts=line[1], stream=line[2], level=line[3], text=line[4])
+                    for line, lid in zip(rows, ids)
                 )
+            )
     finally:
         if _flush_chain is me:
             _flush_chain = None
@@ -315,14 +319,15 @@ def log_start_session(
         return cur.lastrowid
 
 
-def log_heartbeat_live(db: Db, now: float) -> int:
+def log_heartbeat_live(db: Db, now: float, ids: set[int] | None = None) -> int:
     """心跳:把所有进行中会话的 end_time 推到 now(从内存 live_session_ids 选会话)。
 
     由 heartbeat_loop 每 30s 调用。崩溃/强杀后 end_time 停在最后一次心跳(≈死亡时刻,
     误差 ≤ 心跳间隔);下次启动 live_session_ids 为空,残留会话天然 status=ended、
     end_time≈死亡时刻——无需启动收口。运行中状态由 live_session_ids(_sessions)表达,
-    end_time 只管时间。"""
-    ids = live_session_ids()
+    end_time 只管时间。ids:调用方已在事件循环上取好的快照(线程池调用时必传,
+    免在工作线程遍历 _sessions)。"""
+    ids = live_session_ids() if ids is None else ids
     if not ids:
         return 0
     placeholders = ",".join("?" * len(ids))
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 from collections.abc import Callable
 from dataclasses import dataclass
 
@@ -43,29 +44,50 @@ def hit_rate(hits: int, misses: int) -> float:
     return hits / denom if denom else 0.0
 
 
-def _body_str(body: bytes) -> str:
-    return body.decode("utf-8", errors="replace")
+# 行首(可有前导空白)的 data:/event: 字段即判 SSE;单次 C 级扫描,不 splitlines 整体切分
+_SSE_FIELD = re.compile(rb"(?:^|[\r\n])[ \t\f\v]*(?:data|event):")
 
 
-def _is_sse(s: str) -> bool:
-    for line in s.splitlines():
-        ls = line.lstrip()
-        if ls.startswith(("data:", "event:")):
-            return True
-    return False
+def _is_sse(body: bytes) -> bool:
+    return _SSE_FIELD.search(body) is not None
 
 
-def iter_blocks(s: str):
-    """Yield each 'data: <payload>' payload string (skip [DONE])."""
-    for line in s.splitlines():
+def iter_blocks(body: bytes):
+    """Yield each 'data: <payload>' payload (bytes, skip [DONE]). 全程字节态:不整体 decode,
+    payload 直接交 json.loads。"""
+    for line in body.splitlines():
         line = line.strip()
-        if line.startswith("data: "):
+        if line.startswith(b"data: "):
             payload = line[6:].strip()
-            if payload and payload != "[DONE]":
+            if payload and payload != b"[DONE]":
                 yield payload
 
 
-def _try_json(s: str):
+def iter_blocks_reversed(body: bytes):
+    """iter_blocks 的逆序惰性版:从尾部逐行回扫(rfind,不 splitlines 整体)。
+    用量帧总在流末,调用方命中即停 → 长流只触及末尾几帧。"""
+    end = len(body)
+    while end > 0:
+        start = max(body.rfind(b"\n", 0, end), body.rfind(b"\r", 0, end)) + 1
+        line = body[start:end].strip()
+        end = start - 1
+        if line.startswith(b"data: "):
+            payload = line[6:].strip()
+            if payload and payload != b"[DONE]":
+                yield payload
+
+
+def _usage_frames(payloads, *keys: bytes):
+    """SSE 帧预筛:仅含用量键子串的帧才 json.loads——内容增量帧(绝大多数)只付一次
+    C 级子串查找,不物化 dict。keys 缺省 → b'"usage"'。"""
+    keys = keys or (b'"usage"',)
+    for p in payloads:
+        if any(k in p for k in keys):
+            yield _try_json(p)
+
+
+def _try_json(s: bytes):
+    """json.loads 直接吃 bytes(自行识别 UTF-8),无需先整体 decode。"""
     try:
         return json.loads(s)
     except (json.JSONDecodeError, ValueError):
@@ -81,14 +103,11 @@ def _to_int(v) -> int:
 
 @_safe
 def parse_openai(body: bytes) -> TokenUsage:
-    s = _body_str(body)
-    if _is_sse(s):
-        blocks = list(reversed(list(iter_blocks(s))))
+    if _is_sse(body):
+        frames = _usage_frames(iter_blocks_reversed(body), b'"usage"', b'"timings"')
     else:
-        obj = _try_json(s)
-        blocks = [json.dumps(obj)] if obj is not None else []
-    for blk in blocks:
-        d = _try_json(blk)
+        frames = (_try_json(body),)  # 单次解析,直接用对象(不 dumps 再 loads 回环)
+    for d in frames:
         if not isinstance(d, dict):
             continue
         t = d.get("timings")
@@ -113,11 +132,9 @@ def parse_openai(body: bytes) -> TokenUsage:
 
 @_safe
 def parse_anthropic(body: bytes) -> TokenUsage:
-    s = _body_str(body)
     in_base = cache_read = cache_create = out = 0
-    if _is_sse(s):
-        for payload in iter_blocks(s):
-            d = _try_json(payload)
+    if _is_sse(body):
+        for d in _usage_frames(iter_blocks(body)):
             if not isinstance(d, dict):
                 continue
             etype = d.get("type")
@@ -131,7 +148,7 @@ def parse_anthropic(body: bytes) -> TokenUsage:
                 if "output_tokens" in u:
                     out = _to_int(u.get("output_tokens"))
     else:
-        u = (_try_json(s) or {}).get("usage") or {}
+        u = (_try_json(body) or {}).get("usage") or {}
         in_base = _to_int(u.get("input_tokens"))
         cache_read = _to_int(u.get("cache_read_input_tokens"))
         cache_create = _to_int(u.get("cache_creation_input_tokens"))
@@ -143,11 +160,9 @@ def parse_anthropic(body: bytes) -> TokenUsage:
 
 @_safe
 def parse_responses(body: bytes) -> TokenUsage:
-    s = _body_str(body)
     usage = {}
-    if _is_sse(s):
-        for payload in iter_blocks(s):
-            d = _try_json(payload)
+    if _is_sse(body):
+        for d in _usage_frames(iter_blocks(body)):
             if not isinstance(d, dict):
                 continue
             if d.get("type") in ("response.completed", "response.incomplete"):
@@ -156,7 +171,7 @@ def parse_responses(body: bytes) -> TokenUsage:
                 if isinstance(u, dict):
                     usage = u
     else:
-        obj = _try_json(s)
+        obj = _try_json(body)
         if isinstance(obj, dict):
             usage = obj.get("usage") or {}
     input_tokens = _to_int(usage.get("input_tokens"))
@@ -172,11 +187,9 @@ def parse_responses(body: bytes) -> TokenUsage:
 def _parse_generic_usage(body: bytes) -> TokenUsage:
     """裸 usage(input_tokens/output_tokens,无缓存字段)的保守口径:总输入/输出
     明确可取,cache 拆分未知 → cache=0、prompt=input。SSE 取首个带用量的块。"""
-    s = _body_str(body)
     inp = out = 0
-    if _is_sse(s):
-        for payload in iter_blocks(s):
-            d = _try_json(payload)
+    if _is_sse(body):
+        for d in _usage_frames(iter_blocks(body)):
             if not isinstance(d, dict):
                 continue
             u = d.get("usage")
@@ -186,7 +199,7 @@ def _parse_generic_usage(body: bytes) -> TokenUsage:
                 if inp or out:
                     break
     else:
-        obj = _try_json(s)
+        obj = _try_json(body)
         if isinstance(obj, dict):
             u = obj.get("usage")
             if isinstance(u, dict):
@@ -202,17 +215,17 @@ def parse_generic(body: bytes) -> TokenUsage:
     """保守通用回退:未知路径时按「存在哪些字段」分类(非顺序盲试),避免
     anthropic 与 responses 同字段不同 cache 语义的错配。仅无歧义信号返回非零,
     否则归零——宁可漏计也不误记(用量/计费是 DB 事实)。显式注册表仍为主路。"""
-    s = _body_str(body)
-    if "timings" in s:
+    # 字段存在性按字节子串判定,无需整体 decode
+    if b"timings" in body:
         return parse_openai(body)  # llama.cpp native(infill 等);parse_openai 内含 timings 分支
-    if "input_tokens_details" in s:
+    if b"input_tokens_details" in body:
         return parse_responses(body)  # OpenAI Responses 缓存口径
-    if "cache_read_input_tokens" in s or "cache_creation_input_tokens" in s:
+    if b"cache_read_input_tokens" in body or b"cache_creation_input_tokens" in body:
         return parse_anthropic(body)  # Anthropic 缓存口径
     if (
-        "usage" in s
-        and "input_tokens" in s
-        and not ("prompt_tokens" in s or "completion_tokens" in s)
+        b"usage" in body
+        and b"input_tokens" in body
+        and not (b"prompt_tokens" in body or b"completion_tokens" in body)
     ):
         return _parse_generic_usage(body)  # 裸 input/output,无缓存字段
     return parse_openai(body)  # openai 形态(prompt_tokens/completion_tokens)
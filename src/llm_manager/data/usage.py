@@ -7,6 +7,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import math
 import time
 from dataclasses import dataclass
@@ -18,6 +20,8 @@ from llm_manager.data.persistence import Db
 if TYPE_CHECKING:
     from llm_manager.config import AppConfig, Pricing, PricingTier
 
+logger = logging.getLogger(__name__)
+
 
 def _resolve_model_id_locked(db: Db, model_name: str) -> int:
     """Insert-or-return model id. Caller MUST already hold db.write_lock
@@ -47,15 +51,90 @@ def record_usage(
     cache_n: int,
     prompt_n: int,
 ) -> None:
+    record_usage_many(
+        db, [(model_name, start, end, input_tokens, output_tokens, cache_n, prompt_n)]
+    )
+
+
+# (model_name, start, end, input_tokens, output_tokens, cache_n, prompt_n)
+UsageRow = tuple[str, float, float, int, int, int, int]
+
+
+def record_usage_many(db: Db, rows: list[UsageRow]) -> None:
+    """批量落库:一次 write_lock + executemany + 一次 commit(N 行一次 fsync)。"""
     with db.write_lock:
-        mid = _resolve_model_id_locked(db, model_name)
-        db.conn.execute(
+        ids: dict[str, int] = {}
+        params = []
+        for model_name, start, end, input_tokens, output_tokens, cache_n, prompt_n in rows:
+            mid = ids.get(model_name)
+            if mid is None:
+                mid = ids[model_name] = _resolve_model_id_locked(db, model_name)
+            params.append((mid, start, end, input_tokens, output_tokens, cache_n, prompt_n))
+        db.conn.executemany(
             "INSERT INTO model_requests (model_id, start_time, end_time, input_tokens, output_tokens, cache_n, prompt_n) VALUES (?,?,?,?,?,?,?)",
-            (mid, start, end, input_tokens, output_tokens, cache_n, prompt_n),
+            params,
         )
         db.conn.commit()
 
 
+# 组提交(group commit):并发请求的用量行合流为一个 drain 任务,每轮一次 to_thread +
+# 一次 commit;drain 写库期间到达的行自动并入下一轮。事件循环单线程,无需锁。
+_usage_queue: list[tuple[Db, UsageRow]] = []
+_usage_next: asyncio.Future | None = None  # 当前排队(未落库)行的完成信号
+_usage_drain: asyncio.Task | None = None
+
+
+async def record_usage_grouped(db: Db, row: UsageRow) -> None:
+    """异步入口:入队并等待所在批次落库(返回即已写入,语义同 record_usage)。
+    shield:调用方被取消(客户端断开)不打断 drain,同批其余行照常落库。"""
+    global _usage_next, _usage_drain
+    loop = asyncio.get_running_loop()
+    if _usage_next is None:
+        _usage_next = loop.create_future()
+    fut = _usage_next
+    _usage_queue.append((db, row))
+    if _usage_drain is None:
+        _usage_drain = loop.create_task(_drain_usage())
+    await asyncio.shield(fut)
+
+
+async def _drain_usage() -> None:
+    global _usage_next, _usage_drain
+    try:
+        while _usage_queue:
+            batch = _usage_queue[:]
+            _usage_queue.clear()
+            done, _usage_next = _usage_next, None
+            assert done is not None  # 队列非空 ⇔ 已建完成信号
+            try:
+                await asyncio.to_thread(_write_batch, batch)
+            except Exception as e:  # 交由各调用方 await 时抛出
+                # 同批调用方可能已全部取消(客户端断开)、无人取走异常:此处先记一次,
+                # 并由回调显式取走,免 asyncio 再报 "Future exception was never retrieved"。
+                logger.warning("usage batch write failed (%d rows)", len(batch), exc_info=True)
+                done.add_done_callback(lambda f: f.cancelled() or f.exception())
+                done.set_exception(e)
+            else:
+                done.set_result(None)
+    finally:
+        _usage_drain = None
+
+
+async def flush_usage() -> None:
+    """关停用:等待在途 drain 把已入队行全部落库(drain 自会续跑写库期间新到的行)。
+    无在途 drain → 立即返回。落库异常已交由各调用方处理,此处不再抛出。"""
+    while _usage_drain is not None:
+        await asyncio.gather(asyncio.shield(_usage_drain), return_exceptions=True)
+
+
+def _write_batch(batch: list[tuple[Db, UsageRow]]) -> None:
+    by_db: dict[int, tuple[Db, list[UsageRow]]] = {}
+    for db, row in batch:
+        by_db.setdefault(id(db), (db, []))[1].append(row)
+    for db, rows in by_db.values():
+        record_usage_many(db, rows)
+
+
 # 进行中(已 start 未 end)的运行段 id——内存态,与 logs._sessions 对称。
 # 心跳据此选段写 end_time;record_runtime_end 据此 discard;崩溃随进程消失。
 # 不依赖 end_time IS NULL 定位运行段(心跳会持续把运行段 end_time 推到 now)。
@@ -67,15 +146,29 @@ def live_segment_ids() -> set[int]:
     return set(_live_segments)
 
 
+# 运行段与窗口相交的收口条件:end_time 落在窗口起点之后,或本进程内仍进行中(id ∈ 占位符)。
+# 进行中的段 DB 里 end_time 只到上次心跳(或预置的 start),须按 now 计,故按 id 放行。
+_RUNTIME_OPEN_SQL = "(r.end_time IS NULL OR r.end_time > ? OR r.id IN ({}))"
+
+
+def _segment_end(row, live: set[int], now_ts: float) -> float:
+    """计费用的段终点:本进程进行中 / 旧库遗留 NULL → now;否则落库 end_time(心跳/关闭值)。"""
+    if row["id"] in live or row["end_time"] is None:
+        return now_ts
+    return row["end_time"]
+
+
 def record_runtime_start(db: Db, model_name: str, start: float) -> int:
     """Begin a model-loaded billing session (model reached ROUTING);返回段 id。
     Auto-creates the models row (a model can load before any request)。段 id 记入
-    _live_segments(心跳/关闭用);end_time 由心跳维持,不兼任「运行中」标识。"""
+    _live_segments(心跳/关闭用);end_time 由心跳维持,不兼任「运行中」标识。
+    end_time 插入即预置为 start(一次写入):首个心跳前崩溃 → 段按零时长收口,而非 NULL
+    被计费查询当「运行至今」无限累计。"""
     with db.write_lock:
         mid = _resolve_model_id_locked(db, model_name)
         cur = db.conn.execute(
-            "INSERT INTO model_runtime (model_id, start_time, end_time) VALUES (?,?,NULL)",
-            (mid, start),
+            "INSERT INTO model_runtime (model_id, start_time, end_time) VALUES (?,?,?)",
+            (mid, start, start),
         )
         db.conn.commit()
         assert cur.lastrowid is not None
@@ -84,13 +177,13 @@ def record_runtime_start(db: Db, model_name: str, start: float) -> int:
         return sid
 
 
-def runtime_heartbeat_live(db: Db, now: float) -> int:
+def runtime_heartbeat_live(db: Db, now: float, ids: set[int] | None = None) -> int:
     """心跳:把所有进行中运行段的 end_time 推到 now(从内存 _live_segments 选段)。
 
     由 heartbeat_loop 每 30s 调用。崩溃/强杀后 end_time 停在最后一次心跳(≈死亡时刻,
     误差 ≤ 心跳间隔)——usage_cost 直接读 end_time,不再按 now 持续计费、不含停机时长,
-    也无需启动收口。"""
-    ids = live_segment_ids()
+    也无需启动收口。ids 语义同 logs.log_heartbeat_live(线程池调用时由事件循环取快照)。"""
+    ids = live_segment_ids() if ids is None else ids
     if not ids:
         return 0
     placeholders = ",".join("?" * len(ids))
@@ -320,12 +413,15 @@ def usage_cost(
     start_ts: float,
     end_ts: float,
     now: float | None = None,
+    live: set[int] | None = None,
 ) -> CostSummary:
     """Aggregate cost (yuan) over [start_ts, end_ts). tier 模型逐请求 tier_cost;
     hourly 模型按 model_runtime 与窗口重叠秒 × hourly_price/3600。免费/无数据模型省略。
 
     两套独立数据源:tier 走 model_requests(按 end_time 落窗);hourly 走
-    model_runtime(按与窗口的重叠时长)。end_time IS NULL 的运行段用 now 收口。"""
+    model_runtime(按与窗口的重叠时长)。进行中(本进程 _live_segments)的运行段用 now 收口。
+    live:调用方已在事件循环上取好的进行中段 id 快照(线程池调用时必传,免在工作线程
+    读 _live_segments;语义同 runtime_heartbeat_live 的 ids)。"""
     now_ts = now if now is not None else time.time()
     acc: dict[str, float] = {}
 
@@ -359,17 +455,18 @@ def usage_cost(
         if m.pricing.pricing_type == "hourly" and m.pricing.hourly_price > 0
     }
     if hourly:
+        live = live_segment_ids() if live is None else live
         rows = db.conn.execute(
-            "SELECT m.original_name AS model, r.start_time, r.end_time "
+            "SELECT m.original_name AS model, r.id, r.start_time, r.end_time "
             "FROM model_runtime r JOIN models m ON r.model_id=m.id "
-            "WHERE r.start_time < ? AND (r.end_time IS NULL OR r.end_time > ?)",
-            (end_ts, start_ts),
+            f"WHERE r.start_time < ? AND {_RUNTIME_OPEN_SQL.format(','.join('?' * len(live)))}",
+            (end_ts, start_ts, *live),
         ).fetchall()
         for row in rows:
             rate = hourly.get(row["model"])
             if not rate:
                 continue
-            sess_end = row["end_time"] if row["end_time"] is not None else now_ts
+            sess_end = _segment_end(row, live, now_ts)
             overlap = _overlap(start_ts, end_ts, row["start_time"], sess_end)
             if overlap > 0:
                 acc[row["model"]] = acc.get(row["model"], 0.0) + overlap * rate / 3600.0
@@ -394,10 +491,11 @@ def usage_cost_series(
     end_ts: float,
     bucket_seconds: int,
     now: float | None = None,
+    live: set[int] | None = None,
 ) -> UsageSeries:
     """Bucketed cost series (元/桶),时钟对齐分桶(同 usage_series)。tier 成本按请求
     end_time 落桶;hourly 成本按运行段与各桶的重叠时长摊到桶。返回 UsageSeries 形
-    (total/models 的值是元,非 token)。"""
+    (total/models 的值是元,非 token)。live 语义同 usage_cost。"""
     first, buckets = _bucket_axis(start_ts, end_ts, bucket_seconds)
     n = len(buckets)
     if not buckets:
@@ -445,17 +543,19 @@ def usage_cost_series(
     if hourly_rates:
         names = list(hourly_rates)
         placeholders = ",".join("?" * len(names))
+        live = live_segment_ids() if live is None else live
         rows = db.conn.execute(
-            f"SELECT mm.original_name AS model, r.start_time, r.end_time "
+            f"SELECT mm.original_name AS model, r.id, r.start_time, r.end_time "
             f"FROM model_runtime r JOIN models mm ON r.model_id=mm.id "
-            f"WHERE mm.original_name IN ({placeholders}) AND r.start_time < ? AND (r.end_time IS NULL OR r.end_time > ?)",
-            (*names, end_ts, start_ts),
+            f"WHERE mm.original_name IN ({placeholders}) AND r.start_time < ? "
+            f"AND {_RUNTIME_OPEN_SQL.format(','.join('?' * len(live)))}",
+            (*names, end_ts, start_ts, *live),
         ).fetchall()
         for row in rows:
             rate = hourly_rates.get(row["model"])
             if not rate:
                 continue
-            sess_end = row["end_time"] if row["end_time"] is not None else now_ts
+            sess_end = _segment_end(row, live, now_ts)
             for i in range(n):
                 b_start = first + i * bucket_seconds
                 ov = _overlap(b_start, b_start + bucket_seconds, row["start_time"], sess_end)
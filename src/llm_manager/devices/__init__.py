@@ -7,10 +7,15 @@ for display). 每个适配器文件内按平台分割路径,每次仅激活一
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import re
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Protocol, TypeVar
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True, slots=True)
@@ -36,10 +41,14 @@ from .cpu import CpuAdapter
 from .intel import IntelAdapter
 from .nvidia import NvidiaAdapter
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
 
-def _tokens(name: str) -> set[str]:
-    """小写 + 按非字母数字拆 token。'RTX 4060 Ti'→{rtx,4060,ti};'V100-SXM2'→{v100,sxm2}。"""
-    return set(re.findall(r"[a-z0-9]+", name.lower()))
+@functools.lru_cache(maxsize=64)
+def _tokens(name: str) -> frozenset[str]:
+    """小写 + 按非字母数字拆 token。'RTX 4060 Ti'→{rtx,4060,ti};'V100-SXM2'→{v100,sxm2}。
+    设备/配置名来自极小集合、每次 refresh 逐对重复拆分 → 缓存(frozenset 不可变,可安全共享)。"""
+    return frozenset(_TOKEN_RE.findall(name.lower()))
 
 
 def match_devices(
@@ -112,8 +121,12 @@ class DeviceMonitor:
             except Exception:  # noqa: BLE001, S110 — 单个后端失败不影响其他
                 pass
 
+        # 按对象身份预建索引:免 order_key 内 candidates.index 的 O(n) 值比较(同型号
+        # 多卡的 DeviceInfo 可能值相等,index 会都命中第一张)
+        pos = {id(c): i for i, c in enumerate(candidates)}
+
         def order_key(kv: tuple[str, DeviceInfo]) -> tuple[int, int]:
-            idx = candidates.index(kv[1])
+            idx = pos[id(kv[1])]
             return (_DEVICE_KIND_RANK.get(kinds[idx], 9), idx)
 
         matched, unmatched = match_devices(self._get_referenced(), candidates)
@@ -131,6 +144,32 @@ class DeviceMonitor:
         return dict(self._cache)
 
 
+# 设备采样(nvidia-smi / intel_gpu_top / LHM)专用单线程执行器:lifecycle 冷启动、
+# DeviceFeed 轮询、API 兜底、auto_start 的 refresh 在此串行——并发 refresh 只会重复拉起
+# 采样子进程、并发触碰 LHM Computer;且长耗时采样不再占用默认线程池(DB 写 / Popen 等
+# to_thread 调用方不被饿死)。
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="devices")
+# fn → 已排队、尚未开始执行的采样 future(single-flight 合并,见 run_io)
+_queued: dict[Callable, asyncio.Future] = {}
+
+
+async def run_io(fn: Callable[[], T]) -> T:
+    """在设备专用线程上执行阻塞采样调用(替代 asyncio.to_thread)。
+    同一 fn 已排队但尚未开始 → 直接合并到那一次:它必在本次请求之后才开始采样,结果同样
+    新鲜(驱逐后的 re-refresh 不会拿到驱逐前的旧显存),而 nvidia-smi 等子进程少跑一轮。
+    不用 TTL 缓存正因为此:时间窗内复用会把驱逐前的读数当成新鲜值。fn 须幂等(采样类)。"""
+    loop = asyncio.get_running_loop()
+    fut = _queued.get(fn)
+    if fut is None or fut.get_loop() is not loop:
+
+        def _run() -> T:
+            _queued.pop(fn, None)  # 开始即出队:此后到达的调用方另排新一轮
+            return fn()
+
+        fut = _queued[fn] = loop.run_in_executor(_IO_EXECUTOR, _run)
+    return await asyncio.shield(fut)  # 单个调用方被取消不连带取消共享的采样
+
+
 def build_adapters() -> list[DeviceAdapter]:
     """恒注册 4 个设备适配器;平台/工具检测内移到各适配器 enumerate()(不适用时返回 [])。"""
     return [NvidiaAdapter(), IntelAdapter(), AmdAdapter(), CpuAdapter()]
@@ -1,4 +1,5 @@
-"""设备适配器共享辅助:_DRM_CLASS/_drm_cards(DRM sysfs)、_system_mem(系统内存)、
+"""设备适配器共享辅助:_DRM_CLASS/_drm_cards(DRM sysfs)、_tool_path(采样工具 PATH 解析)、
+_system_mem(系统内存)、
 _hwmon_temp1(hwmon 温度)、_read_float/_read_int_mb(数值读取)以及 Windows LHM 运行时
 (单例 _lhm_computer + 跨设备共享折叠 _aggregate_sensors;设备私有解析如 CPU Tctl 温度
 在各设备文件内部,遵循「每设备文件按平台分割路径」)。"""
@@ -6,6 +7,8 @@ _hwmon_temp1(hwmon 温度)、_read_float/_read_int_mb(数值读取)以及 Window
 from __future__ import annotations
 
 import atexit
+import functools
+import shutil
 import threading
 from collections.abc import Iterator
 from pathlib import Path
@@ -19,6 +22,14 @@ if TYPE_CHECKING:
 _DRM_CLASS = Path("/sys/class/drm")  # 模块级常量,测试 monkeypatch 重定向
 
 
+@functools.cache
+def _tool_path(name: str) -> str | None:
+    """外部采样工具(nvidia-smi / intel_gpu_top)的 PATH 解析,进程内只做一次:
+    refresh 在订阅期每 2s 一轮,shutil.which 每次逐 PATH 目录 stat(缺失工具最贵)。
+    工具随驱动安装/卸载才变化,重启后生效。"""
+    return shutil.which(name)
+
+
 def _system_mem() -> tuple[int, int, int]:
     """系统 RAM 快照 (total, avail, used) MB;psutil 失败 → (0,0,0) 降级不抛。"""
     try:
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import json
 import os
-import shutil
 import subprocess
 from pathlib import Path
 
@@ -14,6 +14,7 @@ from .common import (
     _drm_cards,
     _lhm_computer,
     _system_mem,
+    _tool_path,
 )
 
 # ==================== Intel iGPU(i915 + intel_gpu_top)====================
@@ -50,7 +51,7 @@ def _run_intel_gpu_top() -> str | None:
     """intel_gpu_top -J 采样输出(JSON 流)或 None(工具缺失/超时/失败)。
     -s 1000 采样 1s;timeout 2 兜底;每轮 refresh 短进程(与 nvidia-smi 同模式)。
     timeout 杀进程返回 124 属预期(指标照收);非预期失败(工具缺失/超时 4s)→ None。"""
-    if shutil.which("intel_gpu_top") is None:
+    if _tool_path("intel_gpu_top") is None:
         return None
     try:
         r = subprocess.run(
@@ -73,8 +74,6 @@ def _parse_intel_gpu_top(stdout: str | None) -> dict | None:
     返回 {busy_pct, freq_mhz, power_watts};无有效帧/不可解析 → None。"""
     if not stdout:
         return None
-    import json
-
     decoder = json.JSONDecoder()
     buf, last = stdout, None
     while True:
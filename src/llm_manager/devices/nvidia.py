@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import shutil
 import subprocess
 from typing import NamedTuple
 
 from . import DeviceInfo
+from .common import _tool_path
 
 
 class _GpuRow(NamedTuple):
@@ -46,7 +46,7 @@ def _parse_smi(stdout: str) -> list[_GpuRow]:
 
 
 def _run_smi() -> str:
-    smi = shutil.which("nvidia-smi")
+    smi = _tool_path("nvidia-smi")
     if smi is None:
         return ""
     try:
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from fastapi import Request
 from pydantic import BaseModel
 
@@ -19,6 +21,16 @@ def get_config_store(request: Request) -> ConfigStore:
     return request.app.state.config_store
 
 
+def db_size_bytes(request: Request) -> int | None:
+    """库文件字节数(resolved_db,create_app 注入);文件不存在 → None。
+    直接 stat 并捕获异常(EAFP):免 exists()+stat() 两次系统调用及其间的竞态。"""
+    db_path = Path(str(getattr(request.app.state, "resolved_db", "data/llm_manager.db")))
+    try:
+        return db_path.stat().st_size
+    except OSError:
+        return None
+
+
 def sse_frame(payload: BaseModel) -> str:
     """SSE ``data:`` 帧(JSON 序列化)——models/devices/logs 三个流端点共用。"""
     return f"data: {payload.model_dump_json()}\n\n"
@@ -17,9 +17,10 @@ from dataclasses import replace
 from pathlib import Path
 from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from llm_manager import state
 from llm_manager.config import AppConfig, Command, ModelConfig, Pricing, PricingTier, Scheme
 from llm_manager.data import logs as _logs
 from llm_manager.data.config_store import (
@@ -29,8 +30,10 @@ from llm_manager.data.config_store import (
     mutate_appconfig,
     set_settings,
 )
-from llm_manager.gateway.api.common import get_config_store, get_db
-from llm_manager.tray import claude
+from llm_manager.gateway.api.common import db_size_bytes, get_config_store, get_db
+from llm_manager.launcher import RESTART_EXIT_CODE
+from llm_manager.state import ModelStatus
+from llm_manager.tray import claude, wol
 
 try:
     from importlib.metadata import PackageNotFoundError
@@ -47,9 +50,6 @@ logger = logging.getLogger(__name__)
 
 _RESTART_FIELDS = ("host", "port", "claude_settings_path", "log_level")
 
-# 退出码 81 契约:生产监督器与 Dev-Backend.bat 均在其上重启
-RESTART_EXIT_CODE = 81
-
 
 class ProgramUpdate(BaseModel):
     host: str | None = None
@@ -293,8 +293,6 @@ def _restart_fields(snapshot, boot: dict) -> list[str]:
 
 def _serving() -> list[str]:
     """当前正在服务(ROUTING 且 pending>0)的模型——restart 会中断它们。"""
-    from llm_manager import state
-
     return [n for n in state.routing_names() if state.pending_count(n) > 0]
 
 
@@ -307,9 +305,6 @@ def _config_write_result(request: Request, cfg: AppConfig) -> dict:
 def _routing_served(primary: str, cfg: AppConfig) -> list[str]:
     """操作触及的模型若当前 ROUTING,返回其 served name(aliases[0]);用于 PUT 的 restart 提示。
     DELETE 的 ROUTING 拦截在端点处(404/409 之前)。"""
-    from llm_manager import state
-    from llm_manager.state import ModelStatus
-
     if state.get_status(primary) == ModelStatus.ROUTING:
         return [cfg.models[primary].aliases[0]]
     return []
@@ -319,12 +314,11 @@ def register_config_routes(api: APIRouter) -> None:
     @api.get("/system/info")
     def system_info(request: Request) -> dict:
         started_at = getattr(request.app.state, "started_at", None) or time.time()
-        db_path = Path(str(getattr(request.app.state, "resolved_db", "data/llm_manager.db")))
         return {
             "version": _VERSION,
             "started_at": started_at,
             "uptime_s": max(0.0, time.time() - started_at),
-            "db_size_bytes": db_path.stat().st_size if db_path.exists() else None,
+            "db_size_bytes": db_size_bytes(request),
         }
 
     @api.get("/config")
@@ -395,10 +389,8 @@ def register_config_routes(api: APIRouter) -> None:
     def send_wol_now(request: Request, body: WolUpdate) -> dict:
         """立即发送魔术包(WebUI「发送魔术包」;按请求体地址,与托盘 send_wol 同款)。
         广播/MAC 非法(如 build_magic_packet 校验失败)→ 422。"""
-        from llm_manager.tray import wol as wol_impl
-
         try:
-            wol_impl.send_wol(body.mac_address, body.broadcast_address)
+            wol.send_wol(body.mac_address, body.broadcast_address)
         except Exception as e:
             raise HTTPException(422, f"发送失败: {e}") from e
         return {"ok": True}
@@ -452,20 +444,16 @@ def register_config_routes(api: APIRouter) -> None:
         return _config_write_result(request, get_config_store(request).snapshot())
 
     @api.post("/config/restart", status_code=202)
-    async def restart_app(request: Request) -> dict:
-        """请求优雅重启:置 app.state.restart_requested;有 uvicorn server → 后台延迟翻
-        should_exit(让 202 先冲刷),worker 优雅跑完 lifespan 收尾后以 81 退出。
-        无 server(dev --reload)→ 0.5s 后 os._exit(81)(dev 无监督器,需手动重启)。
+    async def restart_app(request: Request, background: BackgroundTasks) -> dict:
+        """请求优雅重启:置 app.state.restart_requested;有 uvicorn server → 经 BackgroundTasks
+        在 202 响应发送完毕后即翻 should_exit(以完成信号代替盲等 0.5s),worker 优雅跑完
+        lifespan 收尾后以 81 退出。无 server(dev --reload)→ 0.5s 后 os._exit(81)(硬退出
+        不等套接字冲刷,故保留延迟;dev 无监督器,需手动重启)。
         生产路径:内置 parent 监督器接住 81 拉起全新 worker(不依赖外部 bat/sh)。"""
         request.app.state.restart_requested = True
         server = getattr(request.app.state, "uvicorn_server", None)
         if server is not None:
-
-            async def _delayed_exit() -> None:
-                await asyncio.sleep(0.5)
-                server.should_exit = True
-
-            asyncio.create_task(_delayed_exit())
+            background.add_task(setattr, server, "should_exit", True)
         else:
 
             async def _dev_exit() -> None:
@@ -544,9 +532,6 @@ def register_config_routes(api: APIRouter) -> None:
         is_rename = body.name != name
         if is_rename:
             # 运行中拦截:活跃态改名会与 state(primary_name keyed)/lifecycle 错位
-            from llm_manager import state
-            from llm_manager.state import ModelStatus
-
             st = state.get_status(name)
             if st not in (ModelStatus.STOPPED, ModelStatus.FAILED):
                 raise HTTPException(409, f"model '{name}' is {st.value}; stop it before renaming")
@@ -600,9 +585,6 @@ def register_config_routes(api: APIRouter) -> None:
         cfg = store.snapshot()
         if name not in cfg.models:
             raise HTTPException(404, f"model '{name}' not found")
-        from llm_manager import state
-        from llm_manager.state import ModelStatus
-
         if state.get_status(name) == ModelStatus.ROUTING:
             raise HTTPException(409, f"model '{name}' is routing; stop it before deleting")
         aliases = cfg.models[name].aliases  # 快照仍在,先取别名(删日志匹配用)
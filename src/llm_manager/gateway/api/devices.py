@@ -8,7 +8,6 @@ so it can be unit-tested directly without the HTTP stack.
 
 from __future__ import annotations
 
-import asyncio
 from collections.abc import AsyncIterator
 from dataclasses import asdict
 
@@ -16,7 +15,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from llm_manager.devices import DeviceInfo
+from llm_manager.devices import DeviceInfo, run_io
 from llm_manager.gateway.api.common import sse_frame
 from llm_manager.realtime import DeviceFeed
 
@@ -66,7 +65,7 @@ def register_devices_routes(router: APIRouter) -> None:
         snap = feed.current_snapshot()
         if not snap:
             monitor = request.app.state.monitor
-            await asyncio.to_thread(monitor.refresh)
+            await run_io(monitor.refresh)
             snap = monitor.snapshot()
         return DevicesResponse(data=[_to_schema(d) for d in snap.values()])
 
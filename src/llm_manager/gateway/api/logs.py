@@ -49,6 +49,7 @@ def _resolve_model(request: Request, model: str | None) -> str | None:
 
 async def _session_stream(session_id: int, level: str | None, db, q) -> AsyncIterator[str]:
     """无限 SSE:先回填最近 limit 行(可 level 过滤),再实时推广播行。
+    回填与每批广播各合成一个 chunk 写出(帧格式不变,只是少了逐行 send)。
 
     q 由端点先 subscribe(存在性校验,None → 404——生成器内 raise HTTPException
     不会转成 404,响应头已发)。finally 里 unsubscribe 与端点 subscribe 对称。"""
@@ -57,12 +58,15 @@ async def _session_stream(session_id: int, level: str | None, db, q) -> AsyncIte
         backfill = await asyncio.to_thread(
             _logs.log_lines_backfill, db, session_id, limit=2048, level=level
         )
-        for r in backfill:
-            yield sse_frame(_to_line(r))
+        if backfill:
+            yield "".join(sse_frame(_to_line(r)) for r in backfill)  # 回填一次写出
         while True:
-            line = await q.get()
-            if level is None or line.level == level:
-                yield sse_frame(_to_line(line))
+            batch = await q.get()  # 一次 flush 的整批行
+            frames = "".join(
+                sse_frame(_to_line(line)) for line in batch if level is None or line.level == level
+            )
+            if frames:
+                yield frames
     finally:
         _logs.unsubscribe(session_id, q)
 
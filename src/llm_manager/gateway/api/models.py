@@ -47,18 +47,19 @@ def build_models_response(cfg: config.AppConfig) -> ModelsResponse:
     timestamps so the SSE change-detect only fires on real state changes."""
     items: list[ModelInfo] = []
     for name, m in cfg.models.items():
+        rec = state.get_record(name)  # 每模型一次查表(原逐字段 getter 各查一次)
         items.append(
             ModelInfo(
                 alias=m.aliases[0],
                 mode=m.mode,
                 port=m.port,
                 auto_start=m.auto_start,
-                status=state.get_status(name).value,
-                pid=state.get_pid(name),
-                pending=state.pending_count(name),
-                failure_reason=state.get_failure_reason(name),
-                started_at=state.get_started_at(name),
-                last_access=state.get_last_access_wall(name),
+                status=rec.status.value,
+                pid=rec.pid,
+                pending=rec.pending,
+                failure_reason=rec.failure_reason,
+                started_at=rec.started_at,
+                last_access=rec.last_access_wall,
             )
         )
     return ModelsResponse(data=items)
@@ -7,12 +7,16 @@
 ``cost``         = window cost: tier 模型按请求公式,按时模型按运行重叠。
 ``cost-series``  = bucketed cost series (元/桶), clock-aligned like ``series``.
 
+The cost endpoints are ``async``: they snapshot the loop-owned live-segment ids on the
+event loop and run the SQL via ``asyncio.to_thread`` with that snapshot.
+
 The frontend ticks uptime locally from ``started_at``; series buckets carry wall-clock
 epochs so the chart's x-axis is displayable.
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime
 import logging
 import time
@@ -22,6 +26,7 @@ from pydantic import BaseModel
 
 from llm_manager.data import session
 from llm_manager.data.usage import (
+    live_segment_ids,
     usage_by_model,
     usage_cost,
     usage_cost_series,
@@ -120,7 +125,7 @@ def _resolve_window(preset: str, start: float | None, end: float | None) -> tupl
 
 def register_usage_routes(router: APIRouter) -> None:
     @router.get("/usage/session", response_model=SessionUsageResponse)
-    def session_usage_endpoint(request: Request) -> SessionUsageResponse:
+    async def session_usage_endpoint(request: Request) -> SessionUsageResponse:
         started = getattr(request.app.state, "started_at", None) or time.time()
         s = session.snapshot(started)
         total_cost = 0.0
@@ -130,9 +135,15 @@ def register_usage_routes(router: APIRouter) -> None:
                 # 本次启动消耗 = 窗口 [started_at, now) 的成本(compute-on-read,与用量页同口径;
                 # 上一进程的请求/段 end_time < started_at 自然落在窗外)。best-effort:
                 # 计费计算失败仅降级为 0,不影响 token 面板。
-                total_cost = usage_cost(
-                    get_db(request), store.snapshot(), start_ts=started, end_ts=time.time()
-                ).total_cost
+                cost = await asyncio.to_thread(
+                    usage_cost,
+                    get_db(request),
+                    store.snapshot(),
+                    start_ts=started,
+                    end_ts=time.time(),
+                    live=live_segment_ids(),
+                )
+                total_cost = cost.total_cost
             except Exception:
                 logger.warning("session cost computation failed", exc_info=True)
         return SessionUsageResponse(
@@ -201,7 +212,7 @@ def register_usage_routes(router: APIRouter) -> None:
         ]
 
     @router.get("/usage/cost", response_model=CostSummaryResponse)
-    def usage_cost_endpoint(
+    async def usage_cost_endpoint(
         request: Request,
         period: str = "7d",
         start: float | None = None,
@@ -210,7 +221,9 @@ def register_usage_routes(router: APIRouter) -> None:
         db = get_db(request)
         cfg = get_config_store(request).snapshot()
         s_ts, e_ts = _resolve_window(period, start, end)
-        s = usage_cost(db, cfg, start_ts=s_ts, end_ts=e_ts)
+        s = await asyncio.to_thread(
+            usage_cost, db, cfg, start_ts=s_ts, end_ts=e_ts, live=live_segment_ids()
+        )
         return CostSummaryResponse(
             total_cost=s.total_cost,
             by_model=[
@@ -220,7 +233,7 @@ def register_usage_routes(router: APIRouter) -> None:
         )
 
     @router.get("/usage/cost-series", response_model=UsageSeriesResponse)
-    def usage_cost_series_endpoint(
+    async def usage_cost_series_endpoint(
         request: Request,
         period: str = "7d",
         start: float | None = None,
@@ -229,5 +242,13 @@ def register_usage_routes(router: APIRouter) -> None:
         db = get_db(request)
         cfg = get_config_store(request).snapshot()
         s_ts, e_ts, bucket = _resolve_range(period, start, end)
-        result = usage_cost_series(db, cfg, start_ts=s_ts, end_ts=e_ts, bucket_seconds=bucket)
+        result = await asyncio.to_thread(
+            usage_cost_series,
+            db,
+            cfg,
+            start_ts=s_ts,
+            end_ts=e_ts,
+            bucket_seconds=bucket,
+            live=live_segment_ids(),
+        )
         return UsageSeriesResponse(buckets=result.buckets, total=result.total, models=result.models)
@@ -1,14 +1,15 @@
 """Reverse proxy: alias resolve → lifecycle ensure_running → httpx forward →
 SSE/non-SSE branch → token record. No facade Protocol — calls lifecycle + state.
 
-end_request 分布三处(非 stream return 前 / 各 except / _stream_wrapper finally)
-防 pending 泄漏。_record_usage best-effort(写库失败不污染透传、不短路 end_request)。
-响应头 _strip_headers(extra=connection/content-encoding) 去 hop-by-hop 头
-(proxy 是 response 方向 hop-by-hop 参与者)。"""
+end_request 两处收口:forward 的 finally(非 stream 全路径,含取消)与
+_stream_wrapper 的 finally(stream 交接后)防 pending 泄漏。
+_record_usage best-effort(写库失败不污染透传、不短路 end_request)。
+响应头经 _passthrough_raw_headers(与 _strip_headers(extra=connection/content-encoding)
+同集)去 hop-by-hop 头(proxy 是 response 方向 hop-by-hop 参与者)。"""
 
 from __future__ import annotations
 
-import asyncio
+import functools
 import json
 import logging
 import time
@@ -18,24 +19,66 @@ import httpx
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import Response, StreamingResponse
 
+from llm_manager import state
+from llm_manager.data import metering
+from llm_manager.data import session as _s
+from llm_manager.data import usage as _u
 from llm_manager.gateway.aliases import resolve_alias_checked
+from llm_manager.state import ModelStatus
 
 logger = logging.getLogger(__name__)
 
-_STRIP_BASE = {"content-length", "transfer-encoding"}
+_STRIP_BASE = frozenset({"content-length", "transfer-encoding"})
+
+
+@functools.cache
+def _strip_set(extra: tuple[str, ...]) -> frozenset[str]:
+    """每侧剥离集合只算一次(调用点 extra 为常量元组),免每请求重建 set。"""
+    return _STRIP_BASE | frozenset(extra)
 
 
 def _strip_headers(headers: Mapping[str, str], extra: tuple[str, ...] = ()) -> dict[str, str]:
     """剥离基集(hop-by-hop 通用)+ 每侧额外键:request 侧 +host,response 侧
     +connection/content-encoding。剥离集合与原两个函数逐项一致。"""
-    bad = _STRIP_BASE | set(extra)
+    bad = _strip_set(extra)
     return {k: v for k, v in headers.items() if k.lower() not in bad}
 
 
+# 响应侧剥离集(字节形态,与 _strip_headers(extra=connection/content-encoding) 同集)
+_RESP_STRIP_RAW = frozenset(
+    {b"content-length", b"transfer-encoding", b"connection", b"content-encoding"}
+)
+
+
+def _passthrough_raw_headers(resp) -> list[tuple[bytes, bytes]]:
+    """上游响应头 → ASGI raw 头列表:直接过滤 httpx 原始字节对,免 str 解码 + dict 重建 +
+    Starlette 再编码;同名多值头(set-cookie 等)逐条保留而非逗号合并。"""
+    out = []
+    for k, v in resp.headers.raw:
+        k = k.lower()
+        if k not in _RESP_STRIP_RAW:
+            out.append((k, v))
+    return out
+
+
 def _detect_sse(resp) -> bool:
     return "text/event-stream" in resp.headers.get("content-type", "")
 
 
+# 必不含用量的二进制媒体类型(TTS 音频 / 图片等),按 content-type 前缀匹配
+_BINARY_CONTENT_TYPES = ("audio/", "image/", "video/", "application/octet-stream")
+
+
+def _may_carry_usage(resp) -> bool:
+    """非流式响应是否值得解析用量:2xx/3xx 且非二进制媒体体。错误体与音频/图片不含用量,
+    跳过 metering 的整体扫描与解析;其余(JSON、text/plain 标注的 SSE 体、缺省 content-type)
+    照常交 metering——其非流式解析器本就兼容 SSE 体。"""
+    if resp.status_code >= 400:
+        return False
+    ct = resp.headers.get("content-type", "").lstrip().lower()
+    return not ct.startswith(_BINARY_CONTENT_TYPES)
+
+
 def _extract_model_alias(body) -> str | None:
     return body.get("model") if isinstance(body, dict) else None
 
@@ -48,29 +91,40 @@ def _reserialize(body: dict) -> bytes:
     return json.dumps(body).encode("utf-8")
 
 
-async def _read_body(request: Request):
+async def _read_body(request: Request) -> tuple[bytes, object]:
+    """(原始字节, 解析体):JSON 体解析为 dict 供别名解析,原始字节留作无改写时原样转发;
+    非 JSON / 解析失败 → 解析体即原始字节。"""
+    raw = await request.body()
     if "application/json" in request.headers.get("content-type", ""):
         try:
-            return await request.json()
+            return raw, json.loads(raw)
         except Exception:  # noqa: BLE001
-            return await request.body()
-    return await request.body()
+            return raw, raw
+    return raw, raw
+
+
+# 每后端端口一个长驻连接池。httpx 默认(100 连接 / 20 keepalive / 5s 过期)对本机
+# 高并发转发偏紧:keepalive 太少 → 突发后频繁重建 TCP;过期太短 → 空闲间隙后首请求重连。
+# 不开 HTTP/2:后端(llama.cpp 等)只说 HTTP/1.1,且需额外依赖 h2。
+_UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=512, max_keepalive_connections=128, keepalive_expiry=60.0
+)
 
 
 def _get_or_create_client(pool: dict, port: int) -> httpx.AsyncClient:
+    # 同步函数、单线程事件循环:查-建-存之间无 await,突发并发不会重复建 client,无需锁。
     client = pool.get(port)
     if client is None:
         client = httpx.AsyncClient(
             base_url=f"http://127.0.0.1:{port}",
             timeout=httpx.Timeout(30.0, read=600.0, connect=30.0, write=30.0),
+            limits=_UPSTREAM_LIMITS,
         )
         pool[port] = client
     return client
 
 
 def _inject_include_usage(body: dict, path: str) -> dict:
-    from llm_manager.data import metering
-
     if metering.needs_include_usage(path):
         so = dict(body.get("stream_options") or {})
         so.setdefault("include_usage", True)
@@ -81,10 +135,6 @@ def _inject_include_usage(body: dict, path: str) -> dict:
 async def _record_usage(db, model, path, body_bytes, start, end) -> None:
     """Best-effort:metering 写库失败不污染透传(非 stream 不改 status/body;stream 不截断)
     也不短路 end_request。吞所有异常 + log。同时累加进程内 session 统计(概览用)。"""
-    from llm_manager.data import metering
-    from llm_manager.data import session as _s
-    from llm_manager.data import usage as _u
-
     try:
         usage = metering.parse_tokens(path, body_bytes)
         if not any(
@@ -92,21 +142,28 @@ async def _record_usage(db, model, path, body_bytes, start, end) -> None:
         ):
             return
         _s.add(usage.input_tokens, usage.output_tokens, usage.cache_tokens, usage.prompt_tokens)
-        await asyncio.to_thread(
-            _u.record_usage,
+        await _u.record_usage_grouped(
             db,
-            model,
-            start,
-            end,
-            usage.input_tokens,
-            usage.output_tokens,
-            usage.cache_tokens,
-            usage.prompt_tokens,
+            (
+                model,
+                start,
+                end,
+                usage.input_tokens,
+                usage.output_tokens,
+                usage.cache_tokens,
+                usage.prompt_tokens,
+            ),
         )
     except Exception:
         logger.exception("record_usage failed for model=%s path=%s", model, path)
 
 
+# 流式用量采样窗口:首帧(Anthropic message_start)≤ HEAD,末帧(usage/timings)≤ TAIL。
+# 末帧异常大(如 Responses 的 response.completed 带完整输出)时调大 TAIL 即可。
+STREAM_SAMPLE_HEAD_MAX = 16 * 1024
+STREAM_SAMPLE_TAIL_MAX = 128 * 1024
+
+
 class _StreamSample:
     """头尾双缓冲:只保留首 HEAD_MAX 字节 + 末 TAIL_MAX 字节供 metering 解析用量,
     避免长流式响应(推理模型几分钟输出)整条缓冲导致内存随流时长无界增长、N 个并发流
@@ -118,16 +175,24 @@ class _StreamSample:
     _try_json 回退跳过,完整的 head/tail 事件照常解析(parse_anthropic 需头+尾,
     parse_openai/responses 仅需尾)。"""
 
-    def __init__(self, head_max: int = 16 * 1024, tail_max: int = 128 * 1024) -> None:
+    def __init__(
+        self, head_max: int = STREAM_SAMPLE_HEAD_MAX, tail_max: int = STREAM_SAMPLE_TAIL_MAX
+    ) -> None:
         self._head_max = head_max
         self._tail_max = tail_max
         self._head = bytearray()
         self._tail = bytearray()
 
     def feed(self, chunk: bytes) -> None:
+        # chunk 原样透传给客户端,这里只经 memoryview 切片拷贝窗口所需字节:
+        # 超大 chunk 不再整块 extend 进 tail 再裁掉前部。
+        view = memoryview(chunk)
         if len(self._head) < self._head_max:
-            self._head.extend(chunk[: self._head_max - len(self._head)])
-        self._tail.extend(chunk)
+            self._head += view[: self._head_max - len(self._head)]
+        if len(view) >= self._tail_max:
+            self._tail[:] = view[-self._tail_max :]
+            return
+        self._tail += view
         if len(self._tail) > self._tail_max:
             del self._tail[: len(self._tail) - self._tail_max]
 
@@ -135,12 +200,10 @@ class _StreamSample:
         # 全流 ≤ head 时 head 已含全部,直接返回(避免与 tail 重复拼接致事件重复)。
         if len(self._head) < self._head_max:
             return bytes(self._head)
-        return bytes(self._head) + bytes(self._tail)
+        return b"".join((self._head, self._tail))  # 一次分配(免两次 bytes() 再拼接)
 
 
 async def _stream_wrapper(resp, path, model, db, request_start):
-    from llm_manager import state
-
     sample = _StreamSample()
     try:
         async for chunk in resp.aiter_bytes():
@@ -153,22 +216,22 @@ async def _stream_wrapper(resp, path, model, db, request_start):
 
 
 async def forward(request: Request, path: str, lifecycle, cfg, db, client_pool) -> Response:
-    from llm_manager import state
-    from llm_manager.state import ModelStatus
-
     t0 = time.monotonic()
-    body = await _read_body(request)
+    raw, body = await _read_body(request)
     alias = _extract_model_alias(body)
     primary = resolve_alias_checked(cfg, alias)
     logger.info("REQ %s /%s model=%s", request.method, path, primary)
     served = cfg.models[primary].aliases[0]  # aliases[0]=主别名=下游 served name
+    request_data = raw
     if isinstance(body, dict):
+        mutated = body.get("model") != served
         body["model"] = served  # 内部统一用 aliases[0] 调下游
         if _is_stream(body):
+            before = body.get("stream_options")
             body = _inject_include_usage(body, path)
-        request_data = _reserialize(body)
-    else:
-        request_data = body if isinstance(body, bytes) else b""
+            mutated = mutated or body.get("stream_options") != before
+        if mutated:  # 无改写(客户端已用主别名且无需注入)→ 原字节直发,省一次 dumps+encode
+            request_data = _reserialize(body)
 
     status = await lifecycle.ensure_running(primary, inc_pending=True)
     if status != ModelStatus.ROUTING:
@@ -176,6 +239,7 @@ async def forward(request: Request, path: str, lifecycle, cfg, db, client_pool)
         raise HTTPException(503, f"model '{primary}' not routing (status={status.value})")
 
     request_start = time.time()
+    handed_off = False  # True → end_request 交给 _stream_wrapper 的 finally
     try:
         port = cfg.models[primary].port
         client = _get_or_create_client(client_pool, port)
@@ -185,7 +249,8 @@ async def forward(request: Request, path: str, lifecycle, cfg, db, client_pool)
                 path,
                 headers=_strip_headers(request.headers, extra=("host",)),
                 content=request_data,
-                params=request.query_params,
+                # 原始查询串直传(多值键不丢);POST 常见空串 → None,httpx 免 URL 合并
+                params=request.scope.get("query_string", b"").decode("latin-1") or None,
             ),
             stream=True,
         )
@@ -193,32 +258,32 @@ async def forward(request: Request, path: str, lifecycle, cfg, db, client_pool)
             logger.info(
                 "RESP %d stream model=%s %.2fs", resp.status_code, primary, time.monotonic() - t0
             )
-            return StreamingResponse(
+            handed_off = True
+            out = StreamingResponse(
                 _stream_wrapper(resp, path, primary, db, request_start),
                 status_code=resp.status_code,
-                headers=_strip_headers(resp.headers, extra=("connection", "content-encoding")),
             )
+            out.raw_headers.extend(_passthrough_raw_headers(resp))
+            return out
         content = await resp.aread()
         await resp.aclose()
-        await _record_usage(db, primary, path, content, request_start, time.time())
-        state.end_request(primary)
+        if _may_carry_usage(resp):
+            await _record_usage(db, primary, path, content, request_start, time.time())
         logger.info("RESP %d model=%s %.2fs", resp.status_code, primary, time.monotonic() - t0)
-        return Response(
-            content=content,
-            status_code=resp.status_code,
-            headers=_strip_headers(resp.headers, extra=("connection", "content-encoding")),
-        )
+        out = Response(content=content, status_code=resp.status_code)  # 自带 content-length
+        out.raw_headers.extend(_passthrough_raw_headers(resp))
+        return out
     except HTTPException:
-        state.end_request(primary)
         raise
     except httpx.HTTPError as e:
-        state.end_request(primary)
         logger.warning("upstream error model=%s: %s", primary, e)
         raise HTTPException(502, f"upstream error: {e}")
     except Exception as e:  # noqa: BLE001
-        state.end_request(primary)
         logger.warning("internal model=%s: %s", primary, e)
         raise HTTPException(500, f"internal: {e}")
+    finally:
+        if not handed_off:  # 单点收口:成功 / 各 except / 取消(CancelledError)均不漏 dec
+            state.end_request(primary)
 
 
 def register_proxy_routes(
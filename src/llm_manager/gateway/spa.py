@@ -1,21 +1,51 @@
 """Built-frontend SPA hosting: StaticFiles(/assets) + GET catch-all fallback to
 index.html. Registered LAST (see routes.py) so it never shadows /health,
-/v1/models, /api/*, the proxy catch-alls, or FastAPI built-ins."""
+/v1/models, /api/*, the proxy catch-alls, or FastAPI built-ins.
+
+Cache policy: Vite emits content-hashed files under assets/, so they are served
+``immutable`` (browsers never refetch them); index.html and other shell files are
+``no-cache`` (always revalidated via ETag/Last-Modified → 304 when unchanged), so a
+rebuilt frontend is picked up on the next load."""
 
 from __future__ import annotations
 
 import logging
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
 
 logger = logging.getLogger(__name__)
 
 # 前端构建产物:src/llm_manager/gateway/spa.py → 仓库根 frontend/dist
 _FRONTEND_DIST = Path(__file__).resolve().parents[3] / "frontend" / "dist"
 
+_IMMUTABLE = {"Cache-Control": "public, max-age=31536000, immutable"}
+_REVALIDATE = {"Cache-Control": "no-cache"}
+
+
+class _HashedAssets(StaticFiles):
+    """assets/ 下文件名含内容哈希(Vite 构建):内容变则 URL 变,可永久缓存。"""
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200):
+        resp = super().file_response(full_path, stat_result, scope, status_code)
+        resp.headers.update(_IMMUTABLE)
+        return resp
+
+
+def _shell_response(path: Path, request: Request) -> Response:
+    """外壳文件(index.html 等):no-cache + ETag 协商,If-None-Match 命中 → 304 空体。"""
+    resp = FileResponse(path, headers=_REVALIDATE, stat_result=path.stat())
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and resp.headers["etag"] in (
+        t.strip().removeprefix("W/") for t in if_none_match.split(",")
+    ):
+        return NotModifiedResponse(resp.headers)
+    return resp
+
 
 def register_spa(app: FastAPI) -> None:
     if not _FRONTEND_DIST.is_dir():
@@ -27,23 +57,23 @@ def register_spa(app: FastAPI) -> None:
 
     assets_dir = _FRONTEND_DIST / "assets"
     if assets_dir.is_dir():  # dist 存在但缺 assets/ 时不应让整个网关启动崩溃
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="frontend-assets")
+        app.mount("/assets", _HashedAssets(directory=assets_dir), name="frontend-assets")
+    base = _FRONTEND_DIST.resolve()  # 注册时解析一次,免每请求 resolve
 
     @app.get("/{path:path}")
-    def spa(path: str) -> Response:
+    def spa(path: str, request: Request) -> Response:
         # 不接管 API/代理前缀:未知 /api/*、/v1/* GET 返回 JSON 404,不被 SPA HTML 掩盖
         if path.startswith(("api/", "v1/")):
             return JSONResponse(status_code=404, content={"detail": "Not Found"})
         # 路径必须解析在 dist 内(resolve 折叠 .. 后用 relative_to 校验),防路径穿越
-        base = _FRONTEND_DIST.resolve()
         candidate = (base / path).resolve()
         try:
             candidate.relative_to(base)
         except ValueError:
             return JSONResponse(status_code=404, content={"detail": "not found"})
         if candidate.is_file():
-            return FileResponse(candidate)
+            return _shell_response(candidate, request)
         index = base / "index.html"
         if index.is_file():
-            return FileResponse(index)
+            return _shell_response(index, request)
         return JSONResponse(status_code=404, content={"detail": "frontend not built"})
@@ -0,0 +1,142 @@
+"""parent 监督器:``python -m llm_manager`` 的常驻父进程(spawn worker / 转发信号 / 按码拉新)。
+
+配置变更重启 = 程序内置的 parent+worker(类 NapCat):parent 常驻、不碰 DB,只 spawn
+worker / 转发信号 / 按退出码拉新。worker 每次都是全新进程 → OS 回收一切,构造性干净
+(无进程内重启的隐藏状态泄漏)。退出码协议:81=请求重启,0=正常,其他=崩溃(不自愈)。
+
+本模块只依赖标准库:parent 不导入 FastAPI/httpx/应用栈(冷启动省数百 ms、常驻 RSS 更小),
+应用栈仅在 worker 分支内按需导入(llm_manager.app)。"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 退出码 81 契约:生产监督器与 Dev-Backend.bat 均在其上重启(config_api 重启端点据此退出)
+RESTART_EXIT_CODE = 81
+
+_WORKER_FLAG = "--worker"
+_SHUTDOWN_GRACE = 10.0  # worker 优雅关闭超时(秒);超时强杀,防卡死拽死 parent
+
+
+def _should_respawn(rc: int | None) -> bool:
+    """parent 决策:worker 退出码 → 是否拉新 worker。81=重启→True;其余(0 正常/崩溃)→False。"""
+    return rc == RESTART_EXIT_CODE
+
+
+def _worker_command() -> list[str]:
+    """worker 子进程命令:同解释器跑 `python -m llm_manager --worker`。"""
+    return [sys.executable, "-m", "llm_manager", _WORKER_FLAG]
+
+
+def _spawn_kwargs() -> dict:
+    """worker 进程隔离参数(同 supervisor._popen_kwargs):Win 独立进程组 / POSIX 新会话,
+    使 parent 能显式转发信号(否则 Ctrl-C 直接打到 worker、绕过 parent 编排)。stdio 继承,
+    worker 的 setup_logging 自带控制台+文件 handler,日志直通 parent 控制台。"""
+    kwargs: dict = {"stdout": None, "stderr": None, "stdin": None}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    return kwargs
+
+
+def _forwardable_signals() -> list:
+    """parent 要转发给 worker 的信号。Windows:SIGINT(Ctrl-C)+ SIGBREAK(Ctrl-Break,
+    否则默认处置直接杀 parent、worker 成孤儿);SIGTERM 在 Windows 虽可 import 但外部无法投递,
+    故按平台而非 hasattr 取舍。POSIX:SIGINT + SIGTERM。按能力逐个收录(hasattr)。"""
+    names = ("SIGINT", "SIGBREAK") if os.name == "nt" else ("SIGINT", "SIGTERM")
+    return [getattr(signal, n) for n in names if hasattr(signal, n)]
+
+
+def _send_shutdown(proc) -> None:
+    """向 worker 进程组发优雅关闭信号。Win:CTRL_BREAK_EVENT(需 worker 在独立进程组);
+    POSIX:killpg(SIGTERM)。进程已不在 → 静默。"""
+    try:
+        if os.name == "nt":
+            proc.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+    except (ProcessLookupError, OSError):
+        pass
+
+
+def _force_kill(proc) -> None:
+    """超时兜底:worker 仍运行 → 强杀;已退出 → no-op。"""
+    if proc.poll() is None:
+        try:
+            proc.kill()
+        except Exception:  # noqa: BLE001, S110
+            pass
+
+
+def main() -> None:
+    """入口分派:`--worker` → 跑应用(worker);否则 → parent 监督器。"""
+    if _WORKER_FLAG in sys.argv[1:]:
+        _run_worker()
+    else:
+        _run_parent()
+
+
+def _run_worker() -> None:
+    """worker 分支:此处才导入应用栈(FastAPI/httpx/uvicorn),parent 永不付该导入成本。"""
+    from llm_manager.app import run_worker
+
+    run_worker()
+
+
+def _run_parent() -> None:
+    """parent 监督器:常驻,不碰 DB / 不持 app 状态。spawn worker、转发 Ctrl-C/SIGTERM、
+    按 worker 退出码决定拉新(81)/ 退出(0 或崩溃)。严格顺序:等 rc 到手才 spawn 下一个,
+    故无双 worker 并存、无端口竞争。崩溃不自愈(可见失败)。"""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S"
+    )
+    while True:
+        proc = _spawn_worker()
+        _forward_signals(proc)
+        rc = proc.wait()
+        if _should_respawn(rc) and not _shutting_down:
+            logger.info("worker 请求重启(exit %s),拉起新 worker...", rc)
+            continue
+        logger.info("worker 退出(码 %s),parent 退出。", rc)
+        sys.exit(rc if isinstance(rc, int) else 0)
+
+
+def _spawn_worker():
+    """spawn 一个 worker(继承 stdio,日志直通 parent 控制台)。"""
+    return subprocess.Popen(_worker_command(), **_spawn_kwargs())
+
+
+_shutting_down = False  # 信号转发置位;防止重启间隙收到的信号误触发新 worker 关闭
+
+
+def _forward_signals(proc) -> None:
+    """安装信号转发:parent 收 Ctrl-C/SIGTERM → 转发 worker 进程组使其优雅关闭;
+    并起超时定时器,_SHUTDOWN_GRACE 秒后仍存活 → 强杀(防 worker 卡死拽死 parent)。
+    每轮 worker 重装(指向当轮 proc);_shutting_down 复位。"""
+    global _shutting_down
+    _shutting_down = False
+
+    def _on_signal(signum, frame):
+        global _shutting_down
+        if _shutting_down:
+            return
+        _shutting_down = True
+        logger.info("收到信号 %s,转发给 worker 优雅关闭...", signum)
+        _send_shutdown(proc)
+        watchdog = threading.Timer(_SHUTDOWN_GRACE, _force_kill, args=(proc,))
+        watchdog.daemon = True
+        watchdog.start()
+
+    sigs = _forwardable_signals()
+    for sig in sigs:
+        signal.signal(sig, _on_signal)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("信号转发已安装:%s", ", ".join(signal.Signals(s).name for s in sigs))
@@ -1,10 +1,12 @@
 """Health probes by model mode. 2-phase (shallow /v1/models + deep per-mode),
 shared start_time/timeout budget. httpx (no openai SDK). Never raises:未知 mode
 返回失败结果(不抛),所有路径产出 ProbeResult。预算用 time.monotonic()(墙钟跳变
-如 NTP 校时不扭曲超时预算)。"""
+如 NTP 校时不扭曲超时预算)。轮询间隔用 cancel.wait 代替 time.sleep:stop 置位即刻返回,
+不再让探测线程空等到超时(最长 startup_timeout)。"""
 
 from __future__ import annotations
 
+import threading
 import time
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -43,10 +45,17 @@ def _deep_request(mode: str) -> tuple[str, dict] | None:
 
 
 def _probe(
-    mode: str, label: str, alias: str, port: int, start_time: float | None, timeout: float
+    mode: str,
+    label: str,
+    alias: str,
+    port: int,
+    start_time: float | None,
+    timeout: float,
+    cancel: threading.Event | None,
 ) -> ProbeResult:
     if start_time is None:
         start_time = time.monotonic()
+    wait = (cancel or threading.Event()).wait  # 未置位的 Event.wait(n) ≡ sleep(n)
     client = _make_client(port)
     try:
         ok = False
@@ -57,7 +66,8 @@ def _probe(
                     break
             except Exception:  # noqa: BLE001, S110
                 pass
-            time.sleep(2)
+            if wait(2):
+                return ProbeResult(False, f"{label}探测器已取消")
         if not ok:
             return ProbeResult(False, f"{label}探测器浅层检查超时: 服务在 {timeout:.0f} 秒内不可用")
         deep = _deep_request(mode)
@@ -71,22 +81,23 @@ def _probe(
                     return ProbeResult(True, f"{label}探测器健康检查成功")
             except Exception:  # noqa: BLE001, S110
                 pass
-            time.sleep(1)
+            if wait(1):
+                return ProbeResult(False, f"{label}探测器已取消")
         return ProbeResult(False, f"{label}探测器深层检查超时")
     finally:
         client.close()
 
 
-def probe_chat(alias, port, start_time=None, timeout=300) -> ProbeResult:
-    return _probe("Chat", "聊天", alias, port, start_time, timeout)
+def probe_chat(alias, port, start_time=None, timeout=300, cancel=None) -> ProbeResult:
+    return _probe("Chat", "聊天", alias, port, start_time, timeout, cancel)
 
 
-def probe_embedding(alias, port, start_time=None, timeout=300) -> ProbeResult:
-    return _probe("Embedding", "嵌入", alias, port, start_time, timeout)
+def probe_embedding(alias, port, start_time=None, timeout=300, cancel=None) -> ProbeResult:
+    return _probe("Embedding", "嵌入", alias, port, start_time, timeout, cancel)
 
 
-def probe_reranker(alias, port, start_time=None, timeout=300) -> ProbeResult:
-    return _probe("Reranker", "重排序", alias, port, start_time, timeout)
+def probe_reranker(alias, port, start_time=None, timeout=300, cancel=None) -> ProbeResult:
+    return _probe("Reranker", "重排序", alias, port, start_time, timeout, cancel)
 
 
 probe_registry: dict[str, Callable[..., ProbeResult]] = {
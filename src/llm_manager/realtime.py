@@ -17,31 +17,35 @@ import asyncio
 from collections.abc import Callable
 from typing import Generic, Protocol, TypeVar
 
-from llm_manager.devices import DeviceInfo
+from llm_manager.devices import DeviceInfo, run_io
 
 T = TypeVar("T")
+_UNSET = object()  # ModelFeed 修订号哨兵:未提供 revision / 尚未取过
 
 
 class Broadcaster(Generic[T]):
     """Many-listener fan-out used by SSE push endpoints."""
 
     def __init__(self, maxsize: int = 16) -> None:
-        self._subs: set[asyncio.Queue[T]] = set()
+        # 写时复制:订阅/退订(罕见)换新 frozenset,publish(热路径)直接遍历当前快照,
+        # 无需每次 list() 拷贝;遍历中途退订只替换引用,不影响本轮迭代。
+        self._subs: frozenset[asyncio.Queue[T]] = frozenset()
         self._maxsize = maxsize
 
     def subscribe(self) -> asyncio.Queue[T]:
         """Register a new subscriber; returns its dedicated queue."""
         q: asyncio.Queue[T] = asyncio.Queue(maxsize=self._maxsize)
-        self._subs.add(q)
+        self._subs = self._subs | {q}
         return q
 
     def unsubscribe(self, q: asyncio.Queue[T]) -> None:
         """Drop a subscriber; unknown queues are a safe no-op."""
-        self._subs.discard(q)
+        if q in self._subs:
+            self._subs = self._subs - {q}
 
     def publish(self, item: T) -> None:
         """Fan an item to every subscriber; full queues silently drop (slow consumer)."""
-        for q in list(self._subs):
+        for q in self._subs:
             try:
                 q.put_nowait(item)
             except asyncio.QueueFull:
@@ -63,7 +67,7 @@ class DeviceFeed:
     """Subscriber-gated periodic device-snapshot feed for ``GET /api/devices/stream``.
 
     First subscriber starts the refresh loop; last unsubscribe stops it. The loop
-    refreshes the monitor OFF the event loop (``asyncio.to_thread`` — nvidia-smi / LHM
+    refreshes the monitor OFF the event loop (the devices I/O thread — nvidia-smi / LHM
     are blocking) and publishes each snapshot to all subscribers, so N viewers share a
     single refresh per interval.
     """
@@ -97,7 +101,7 @@ class DeviceFeed:
     async def _loop(self) -> None:
         try:
             while self._bc.subscriber_count > 0:
-                snapshot = await asyncio.to_thread(self._refresh_and_snapshot)
+                snapshot = await run_io(self._refresh_and_snapshot)
                 self._bc.publish(snapshot)
                 await asyncio.sleep(self._interval)
         except asyncio.CancelledError:
@@ -117,14 +121,25 @@ class ModelFeed(Generic[T]):
     would differ every tick; the frontend ticks those locally from timestamps in the
     snapshot. First subscriber starts the loop; last unsubscribe stops it and resets the
     last-seen value so a later resubscribe re-publishes.
+
+    Optional ``revision()`` is a cheap change token (e.g. ``state.revision()`` plus the
+    config snapshot): ticks where it is unchanged skip building ``snapshot()`` entirely,
+    so an idle feed costs one comparison per tick instead of a full rebuild + diff.
     """
 
-    def __init__(self, snapshot: Callable[[], T], interval: float = 0.5) -> None:
+    def __init__(
+        self,
+        snapshot: Callable[[], T],
+        interval: float = 0.5,
+        revision: Callable[[], object] | None = None,
+    ) -> None:
         self._snapshot = snapshot
+        self._revision = revision
         self._bc: Broadcaster[T] = Broadcaster()
         self._interval = interval
         self._task: asyncio.Task[None] | None = None
         self._last: T | None = None
+        self._last_rev: object = _UNSET
 
     def subscribe(self) -> asyncio.Queue[T]:
         q = self._bc.subscribe()
@@ -138,21 +153,32 @@ class ModelFeed(Generic[T]):
             self._task.cancel()
             self._task = None
             self._last = None  # resubscribe should re-publish the initial snapshot
+            self._last_rev = _UNSET
 
     @property
     def subscriber_count(self) -> int:
         return self._bc.subscriber_count
 
     def current_snapshot(self) -> T:
+        """SSE 首帧:修订号未变 → 复用循环最近一次构建的快照,新订阅方不再各自重建。"""
+        if (
+            self._revision is not None
+            and self._last is not None
+            and self._revision() == self._last_rev
+        ):
+            return self._last
         return self._snapshot()
 
     async def _loop(self) -> None:
         try:
             while self._bc.subscriber_count > 0:
-                snap = self._snapshot()
-                if snap != self._last:
-                    self._last = snap
-                    self._bc.publish(snap)
+                rev = self._revision() if self._revision is not None else _UNSET
+                if rev is _UNSET or rev != self._last_rev:
+                    self._last_rev = rev
+                    snap = self._snapshot()
+                    if snap != self._last:
+                        self._last = snap
+                        self._bc.publish(snap)
                 await asyncio.sleep(self._interval)
         except asyncio.CancelledError:
             pass
@@ -6,7 +6,8 @@ import asyncio
 import logging
 import time
 
-from llm_manager import state
+from llm_manager import config, state
+from llm_manager.devices import run_io
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +79,6 @@ async def auto_start(
         logger.info("no auto_start models")
         return
     logger.info("auto_start %d models: %s", len(models), models)
-    from llm_manager import config as _cfg
 
     async def _one(name: str) -> None:
         if stop_event.is_set():
@@ -92,12 +92,12 @@ async def auto_start(
             logger.error("auto_start %s failed: %s", name, e)
 
     # 1. 扫描硬件
-    await asyncio.to_thread(monitor.refresh)
+    await run_io(monitor.refresh)
     online = monitor.online_devices()
     # 2. 收集需求(无 scheme 跳过)
     planned = []
     for name in models:
-        scheme = _cfg.select_adaptive(cfg.models[name], online)
+        scheme = config.select_adaptive(cfg.models[name], online)
         if scheme is None:
             required = sorted(
                 {d for s in cfg.models[name].schemes.values() for d in s.required_devices}
@@ -120,6 +120,6 @@ async def auto_start(
     for name in serial:
         if stop_event.is_set():
             break
-        await asyncio.to_thread(monitor.refresh)
+        await run_io(monitor.refresh)
         await _one(name)
     logger.info("auto_start batch complete")
@@ -4,7 +4,10 @@
 不兼任状态——故心跳可直接写 end_time 而不破坏「运行中」语义。崩溃/强杀(如直接
 关机)后 end_time 停在最后一次心跳(≈死亡时刻,误差 ≤ 心跳间隔);新进程内存集合
 为空,残留会话/段天然 status=ended,无需启动收口。模型正常停止时 lifecycle 再写
-一次精确 end_time(最终值)。"""
+一次精确 end_time(最终值)。
+
+写入经 to_thread 落在工作线程(不在事件循环上等 fsync);进行中 id 集合先在事件循环
+上取快照再交给线程(内存表只在循环线程变更)。无进行中会话/段 → 本轮零写入。"""
 
 from __future__ import annotations
 
@@ -13,7 +16,7 @@ import time
 from typing import TYPE_CHECKING
 
 from llm_manager.data import logs as _logs
-from llm_manager.data.usage import runtime_heartbeat_live
+from llm_manager.data.usage import live_segment_ids, runtime_heartbeat_live
 
 if TYPE_CHECKING:
     from llm_manager.data.persistence import Db
@@ -21,6 +24,11 @@ if TYPE_CHECKING:
 HEARTBEAT_INTERVAL = 30.0  # 秒:老项目同款节奏,崩溃最多丢最后 30s
 
 
+def _beat(db: Db, now: float, log_ids: set[int], seg_ids: set[int]) -> None:
+    _logs.log_heartbeat_live(db, now, log_ids)
+    runtime_heartbeat_live(db, now, seg_ids)
+
+
 async def heartbeat_loop(
     db: Db, stop_event: asyncio.Event, interval: float = HEARTBEAT_INTERVAL
 ) -> None:
@@ -29,8 +37,8 @@ async def heartbeat_loop(
         try:
             await asyncio.wait_for(stop_event.wait(), timeout=interval)
         except TimeoutError:
-            now = time.time()
-            _logs.log_heartbeat_live(db, now)
-            runtime_heartbeat_live(db, now)
+            log_ids, seg_ids = _logs.live_session_ids(), live_segment_ids()
+            if log_ids or seg_ids:
+                await asyncio.to_thread(_beat, db, time.time(), log_ids, seg_ids)
         except asyncio.CancelledError:
             break
@@ -13,6 +13,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import threading
 import time
 from collections.abc import Callable
 from typing import TYPE_CHECKING
@@ -27,6 +28,8 @@ from llm_manager.config import (
     substitute_vars,
 )
 from llm_manager.data import logs as _logs
+from llm_manager.data import usage as _u
+from llm_manager.devices import run_io
 from llm_manager.probes import ProbeResult
 from llm_manager.runtime import scheduling
 from llm_manager.state import ModelStatus
@@ -57,6 +60,8 @@ class Lifecycle:
         self.startup_timeout = startup_timeout
         self._db = db
         self._stop_events: dict[str, asyncio.Event] = {}
+        # alias → 探测线程的取消信号(threading.Event:to_thread 中的探测不能等 asyncio.Event)
+        self._probe_cancels: dict[str, threading.Event] = {}
         self._active_schemes: dict[str, Scheme] = {}
         self._spawn_lock = asyncio.Lock()  # 全局 spawn 锁:并发 spawn 串行,防显存超量
         self._log_session_ids: dict[
@@ -109,6 +114,8 @@ class Lifecycle:
             alias
         )  # 关 runtime 段:必须在首个 await 前 pop alias→seg_id(防并发 restart 抢先开新段覆盖映射;按 id 关,幂等)
         self._stop_events.setdefault(alias, asyncio.Event()).set()
+        if (cancel := self._probe_cancels.get(alias)) is not None:
+            cancel.set()  # 探测线程的轮询间隔即刻返回,不再空等到 startup_timeout
         pid = state.get_pid(alias)
         if pid is not None:
             await self._supervisor.kill_tree(pid)
@@ -135,8 +142,6 @@ class Lifecycle:
         if self._db is None:
             return
         try:
-            from llm_manager.data import usage as _u
-
             seg_id = _u.record_runtime_start(self._db, alias, time.time())
             self._runtime_seg_ids[alias] = seg_id
         except Exception:
@@ -149,8 +154,6 @@ class Lifecycle:
         if seg_id is None:
             return  # 未开过段(exit cb 兜底重复触发)→ 幂等 no-op
         try:
-            from llm_manager.data import usage as _u
-
             _u.record_runtime_end(self._db, seg_id, time.time())
         except Exception:
             logger.warning("record_runtime_end failed for %s", alias, exc_info=True)
@@ -167,7 +170,7 @@ class Lifecycle:
         ev = self._stop_events[alias]
         model = self._cfg_model(alias)
 
-        await asyncio.to_thread(self._devices.refresh)
+        await run_io(self._devices.refresh)
         if ev.is_set():
             return ModelStatus.STOPPED
 
@@ -196,7 +199,7 @@ class Lifecycle:
             if to_stop:
                 logger.info("evict %s to free mem for %s", list(to_stop), alias)
                 await asyncio.gather(*[self.stop(n) for n in to_stop], return_exceptions=True)
-                await asyncio.to_thread(self._devices.refresh)
+                await run_io(self._devices.refresh)
                 snap = self._devices.snapshot()  # re-snapshot after eviction
             if not self._deficit_satisfied(scheme.memory_mb, snap):
                 logger.warning("%s: insufficient resource after eviction", alias)
@@ -218,7 +221,8 @@ class Lifecycle:
                 )
             else:
                 argv = [exe, *args]
-            env = {**os.environ, **c.env}
+            # 无自定义 env → None(Popen 直接继承父进程环境,免每次启动整表拷贝)
+            env = {**os.environ, **c.env} if c.env else None
             rec = await self._supervisor.spawn(
                 argv,
                 env=env,
@@ -260,7 +264,13 @@ class Lifecycle:
 
             if ev.is_set():
                 return await self._abort_spawned(rec.pid)
-            probe = await asyncio.to_thread(self._probe, alias, model.mode)
+            cancel = self._probe_cancels[alias] = threading.Event()
+            try:
+                probe = await asyncio.to_thread(self._probe, alias, model.mode, cancel)
+            finally:
+                cancel.set()  # 本协程被取消时同样叫停后台探测线程
+                if self._probe_cancels.get(alias) is cancel:
+                    del self._probe_cancels[alias]
             logger.info("probe %s %s", alias, "ok" if probe.ok else "fail: " + str(probe.message))
             if ev.is_set():
                 return await self._abort_spawned(rec.pid)
@@ -349,10 +359,10 @@ class Lifecycle:
             )
         return out
 
-    def _probe(self, alias: str, mode: str) -> ProbeResult:
+    def _probe(self, alias: str, mode: str, cancel: threading.Event) -> ProbeResult:
         model = self._cfg_model(alias)
         served = model.aliases[
             0
         ]  # aliases[0]=主别名=下游 served name(lmdeploy --model-name / llama.cpp -a)
         fn = self._probes[mode]
-        return fn(served, model.port, None, self.startup_timeout)
+        return fn(served, model.port, None, self.startup_timeout, cancel)
@@ -32,7 +32,7 @@ _ALLOWED: dict[ModelStatus, frozenset[ModelStatus]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class _Record:
     status: ModelStatus = ModelStatus.STOPPED
     failure_reason: str | None = None
@@ -45,12 +45,25 @@ class _Record:
 
 _state: dict[str, _Record] = {}
 _inflight: dict[str, asyncio.Future] = {}
+# 修订号:每次写入记录即 +1。ModelFeed 以其判定"有无变化",无变化的 tick 免重建快照。
+_revision = 0
+
+
+def _changed() -> None:
+    global _revision
+    _revision += 1
+
+
+def revision() -> int:
+    """Monotonic write counter over all records (change gate for ModelFeed)."""
+    return _revision
 
 
 def _reset() -> None:
     """Test helper: clear all state."""
     _state.clear()
     _inflight.clear()
+    _changed()
 
 
 def _rec(name: str) -> _Record:
@@ -61,6 +74,12 @@ def _rec(name: str) -> _Record:
     return rec
 
 
+def get_record(name: str) -> _Record:
+    """Whole record in one lookup for read-mostly consumers (model snapshot builders).
+    Treat as read-only: writes must go through the functions below (they bump revision)."""
+    return _rec(name)
+
+
 def get_status(name: str) -> ModelStatus:
     return _rec(name).status
 
@@ -85,6 +104,7 @@ def set_status(
         rec.started_at = now_wall
     else:
         rec.started_at = None  # uptime only while ROUTING
+    _changed()
 
 
 def is_runnable(name: str) -> bool:
@@ -101,6 +121,7 @@ def record_failure(name: str, reason: str) -> None:
     rec.failure_reason = reason
     rec.pid = None  # 进程已死/将死/未spawn(所有 caller 调用时如此);清 stale pid 防 _reconcile 漏清 + 防 stop 误 kill 被复用的 pid
     rec.started_at = None  # FAILED → 无 uptime
+    _changed()
 
 
 def get_failure_reason(name: str) -> str | None:
@@ -111,6 +132,7 @@ def touch_activity(name: str) -> None:
     rec = _rec(name)
     rec.last_access = time.monotonic()
     rec.last_access_wall = time.time()
+    _changed()
 
 
 def get_last_access(name: str) -> float:
@@ -130,6 +152,7 @@ def get_last_access_wall(name: str) -> float:
 def _set_last_access(name: str, ts: float) -> None:
     """Test helper:设任意 last_access(background 测试控时间相对值,同 _reset)."""
     _rec(name).last_access = ts
+    _changed()
 
 
 def pending_count(name: str) -> int:
@@ -143,6 +166,7 @@ def routing_names() -> list[str]:
 
 def record_pid(name: str, pid: int) -> None:
     _rec(name).pid = pid
+    _changed()
 
 
 def get_pid(name: str) -> int | None:
@@ -151,24 +175,34 @@ def get_pid(name: str) -> int | None:
 
 def clear_pid(name: str) -> None:
     _rec(name).pid = None
+    _changed()
 
 
 def inc_pending(name: str) -> None:
     _rec(name).pending += 1
+    _changed()
 
 
 def dec_pending(name: str) -> None:
     _rec(name).pending = max(0, _rec(name).pending - 1)
+    _changed()
 
 
 def begin_request(name: str) -> None:
-    inc_pending(name)
-    touch_activity(name)
+    # 每请求热路径:单次 _rec 查表完成计数 + 活跃时间(等价 inc_pending + touch_activity)
+    rec = _rec(name)
+    rec.pending += 1
+    rec.last_access = time.monotonic()
+    rec.last_access_wall = time.time()
+    _changed()
 
 
 def end_request(name: str) -> None:
-    dec_pending(name)
-    touch_activity(name)
+    rec = _rec(name)
+    rec.pending = max(0, rec.pending - 1)
+    rec.last_access = time.monotonic()
+    rec.last_access_wall = time.time()
+    _changed()
 
 
 def claim_start(name: str) -> tuple[asyncio.Future, bool]:
@@ -184,6 +218,7 @@ def claim_start(name: str) -> tuple[asyncio.Future, bool]:
     rec = _rec(name)
     rec.status = ModelStatus.STARTING
     rec.failure_reason = None  # 新一轮启动:清上次失败原因(B3),防 SSE 携带陈旧 reason
+    _changed()
     return fut, True
 
 
@@ -206,6 +241,7 @@ def finish_start(name: str, status: ModelStatus, *, owner: asyncio.Future | None
             rec.failure_reason = "startup failed"
     else:
         rec.failure_reason = None  # 成功(ROUTING)/STOPPED → 清陈旧失败原因(B3)
+    _changed()
     if fut is not None and not fut.done():
         fut.set_result(status)
 
@@ -1,17 +1,28 @@
 """Cross-platform process supervisor. Process-group/session isolation is an
 INTERNAL invariant (Win CREATE_NEW_PROCESS_GROUP, POSIX start_new_session).
-One asyncio wait-task per process replaces the legacy 5s poller. Blocking ops
-(Popen, psutil.wait, killpg) run via asyncio.to_thread."""
+One asyncio wait-task per process replaces the legacy 5s poller; on Linux it
+awaits the process's pidfd on the event loop (no thread held per process), and
+kill_tree awaits the killed tree's pidfds the same way.
+On Windows each child is assigned to its own Job Object (KILL_ON_JOB_CLOSE):
+kill_tree terminates the whole tree with one TerminateJobObject call and waits
+for it to exit; psutil and taskkill remain as fallbacks when no job could be
+attached. On POSIX an owned child is its session's group leader, so one killpg
+kills its tree; descendants that left the group are killed individually, and
+kill_tree waits for the whole pre-kill snapshot to exit.
+Blocking ops (Popen, psutil.wait, killpg) run via asyncio.to_thread."""
 
 from __future__ import annotations
 
 import asyncio
+import ctypes
+import functools
 import os
 import signal
 import subprocess
 import threading
 import time
 from collections.abc import Callable
+from ctypes import wintypes
 from dataclasses import dataclass
 from typing import Protocol, runtime_checkable
 
@@ -51,12 +62,183 @@ def _popen_kwargs() -> dict:
     return kw
 
 
+# ==================== Windows Job Object(ctypes,仅 nt 调用)====================
+_JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+_JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+
+
+class _IoCounters(ctypes.Structure):
+    _fields_ = [(n, ctypes.c_ulonglong) for n in ("r_ops", "w_ops", "o_ops", "r_b", "w_b", "o_b")]
+
+
+class _BasicLimitInformation(ctypes.Structure):
+    _fields_ = [
+        ("PerProcessUserTimeLimit", ctypes.c_int64),
+        ("PerJobUserTimeLimit", ctypes.c_int64),
+        ("LimitFlags", ctypes.c_uint32),
+        ("MinimumWorkingSetSize", ctypes.c_size_t),
+        ("MaximumWorkingSetSize", ctypes.c_size_t),
+        ("ActiveProcessLimit", ctypes.c_uint32),
+        ("Affinity", ctypes.c_size_t),
+        ("PriorityClass", ctypes.c_uint32),
+        ("SchedulingClass", ctypes.c_uint32),
+    ]
+
+
+class _ExtendedLimitInformation(ctypes.Structure):
+    _fields_ = [
+        ("BasicLimitInformation", _BasicLimitInformation),
+        ("IoInfo", _IoCounters),
+        ("ProcessMemoryLimit", ctypes.c_size_t),
+        ("JobMemoryLimit", ctypes.c_size_t),
+        ("PeakProcessMemoryUsed", ctypes.c_size_t),
+        ("PeakJobMemoryUsed", ctypes.c_size_t),
+    ]
+
+
+@functools.cache
+def _kernel32():
+    """kernel32 句柄(进程内一份)并声明所用函数签名:HANDLE 为指针宽,
+    缺省 restype/argtypes 会按 C int 截断 64 位句柄。"""
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+    H, B = wintypes.HANDLE, wintypes.BOOL
+    k32.CreateJobObjectW.restype = H
+    k32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+    k32.SetInformationJobObject.restype = B
+    k32.SetInformationJobObject.argtypes = [H, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD]
+    k32.AssignProcessToJobObject.restype = B
+    k32.AssignProcessToJobObject.argtypes = [H, H]
+    k32.TerminateJobObject.restype = B
+    k32.TerminateJobObject.argtypes = [H, wintypes.UINT]
+    k32.CloseHandle.restype = B
+    k32.CloseHandle.argtypes = [H]
+    return k32
+
+
+def _create_job(popen: subprocess.Popen) -> int | None:
+    """为子进程建独立 Job Object(KILL_ON_JOB_CLOSE)并纳入;任一步失败 → None
+    (kill_tree 回退 psutil/taskkill)。Popen 之后才 Assign,其间派生的孙进程不在 job 内,
+    由回退路径兜底。"""
+    try:
+        k32 = _kernel32()
+        job = k32.CreateJobObjectW(None, None)
+        if not job:
+            return None
+        info = _ExtendedLimitInformation()
+        info.BasicLimitInformation.LimitFlags = _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+        ok = k32.SetInformationJobObject(
+            job, _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION, ctypes.byref(info), ctypes.sizeof(info)
+        ) and k32.AssignProcessToJobObject(job, int(popen._handle))  # type: ignore[attr-defined]
+        if not ok:
+            k32.CloseHandle(job)
+            return None
+        return job
+    except Exception:  # noqa: BLE001 — ctypes/句柄异常 → 无 job,走回退
+        return None
+
+
+def _terminate_job(job: int) -> bool:
+    """一次 TerminateJobObject 杀整棵树(不起 taskkill 子进程),随后关闭句柄。"""
+    try:
+        k32 = _kernel32()
+        try:
+            return bool(k32.TerminateJobObject(job, 1))
+        finally:
+            k32.CloseHandle(job)
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _close_job(job: int) -> None:
+    """关闭 job 句柄;KILL_ON_JOB_CLOSE 下顺带清掉主进程退出后残留的孙进程。"""
+    try:
+        _kernel32().CloseHandle(job)
+    except Exception:  # noqa: BLE001, S110
+        pass
+
+
+def _pidfd_waiter(pid: int) -> asyncio.Future | None:
+    """pidfd 在进程退出(含未回收的僵尸)时变为可读:挂到事件循环 reader 上,返回退出即完成的
+    future——N 个进程的等待复用同一 epoll,不占线程。future 完成/取消时自动摘 reader、关 fd。
+    pid 已不存在 → 已完成的 future;无 pidfd(Windows/macOS/旧内核)或 loop 不支持 → None。"""
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        fd = pidfd_open(pid)
+    except ProcessLookupError:
+        done = loop.create_future()
+        done.set_result(None)
+        return done
+    except OSError:  # 内核不支持 → 回退
+        return None
+    exited = loop.create_future()
+    try:
+        loop.add_reader(fd, lambda: exited.done() or exited.set_result(None))
+    except NotImplementedError:
+        os.close(fd)
+        return None
+
+    def _release(_f: asyncio.Future) -> None:
+        loop.remove_reader(fd)
+        os.close(fd)
+
+    exited.add_done_callback(_release)
+    return exited
+
+
+async def _wait_exit(popen: subprocess.Popen) -> int | None:
+    """等子进程退出并回收。Linux(≥5.3):await pidfd 就绪——不占线程池线程,退出即时唤醒;
+    此时 wait() 只是回收僵尸,立即返回。无 pidfd → 回退 to_thread(popen.wait)。"""
+    exited = _pidfd_waiter(popen.pid)
+    if exited is not None:
+        await exited
+        return popen.wait()
+    return await asyncio.to_thread(popen.wait)
+
+
+async def _wait_gone(procs: list[psutil.Process], timeout: float) -> bool:
+    """kill 后等整棵树消失(True=全部退出)。pidfd 可用 → 所有等待在事件循环上并发;
+    否则该批交 to_thread(psutil.wait_procs)——不再同步阻塞事件循环(stop_all 的 gather
+    因而真正并发)。自有子进程只等到僵尸态,回收仍由 _wait 完成,不与之抢 waitpid。"""
+    futs: list[asyncio.Future] = []
+    rest: list[psutil.Process] = []
+    for p in procs:
+        f = _pidfd_waiter(p.pid)
+        if f is None:
+            rest.append(p)
+        else:
+            futs.append(f)
+    gone = True
+    if futs:
+        _, pending = await asyncio.wait(futs, timeout=timeout)
+        for f in pending:
+            f.cancel()
+        gone = not pending
+    if rest:
+        _, alive = await asyncio.to_thread(psutil.wait_procs, rest, timeout=timeout)
+        gone = gone and not alive
+    return gone
+
+
+def _pgid(pid: int) -> int | None:
+    """POSIX 进程组 id;进程已不在 → None。"""
+    try:
+        return os.getpgid(pid)
+    except OSError:
+        return None
+
+
 class Supervisor:
     def __init__(self) -> None:
         self._procs: dict[int, subprocess.Popen] = {}
         self._wait_tasks: dict[int, asyncio.Task] = {}
         self._exit_cbs: dict[int, Callable[[int], None]] = {}
-        self._readers: dict[int, list[threading.Thread]] = {}
+        # spawn 时建一次 psutil.Process 复用:免每次 kill/探活重建(存在性检查 syscall),
+        # 且其 create_time 绑定可防 PID 复用——kill_tree 不会误杀复用该 pid 的无关进程。
+        self._ps: dict[int, psutil.Process] = {}
+        self._jobs: dict[int, int] = {}  # Windows:pid → Job Object 句柄
 
     async def spawn(
         self,
@@ -79,19 +261,20 @@ class Supervisor:
             **_popen_kwargs(),
         )
         self._procs[popen.pid] = popen
+        try:
+            self._ps[popen.pid] = psutil.Process(popen.pid)
+        except psutil.Error:  # 瞬时退出 → 无缓存,kill/alive 走按 pid 新建
+            pass
+        if os.name == "nt" and (job := _create_job(popen)) is not None:
+            self._jobs[popen.pid] = job
         self._wait_tasks[popen.pid] = asyncio.create_task(self._wait(popen.pid))
         if on_output is not None:
-            threads = [
-                threading.Thread(
-                    target=self._pump, args=(popen.stdout, "out", loop, on_output), daemon=True
-                ),
+            # 读者线程不登记:daemon,管道 EOF(进程退出/被杀)即自然结束,无人 join——
+            # 留引用只会让已结束的 Thread 对象随 pid 表常驻。
+            for pipe, stream in ((popen.stdout, "out"), (popen.stderr, "err")):
                 threading.Thread(
-                    target=self._pump, args=(popen.stderr, "err", loop, on_output), daemon=True
-                ),
-            ]
-            self._readers[popen.pid] = threads
-            for t in threads:
-                t.start()
+                    target=self._pump, args=(pipe, stream, loop, on_output), daemon=True
+                ).start()
         return ProcessRecord(pid=popen.pid, started_at=time.monotonic())
 
     @staticmethod
@@ -118,36 +301,77 @@ class Supervisor:
             # kill_tree 已清理 _procs(快杀路径):本任务自清表项,防 start/stop 循环累积。
             self._wait_tasks.pop(pid, None)
             return
-        rc = await asyncio.to_thread(popen.wait)
+        rc = await _wait_exit(popen)
         cb = self._exit_cbs.get(pid)
         if cb:
             try:
                 cb(rc if rc is not None else -1)
             except Exception:  # noqa: BLE001, S110
                 pass
-        # 进程已退出:四张表一并自清(读者线程随管道 EOF 自然结束;kill_tree 的
+        # 进程已退出:各表一并自清(读者线程随管道 EOF 自然结束;kill_tree 的
         # finally 也清,双路径幂等 pop——防 start/stop 循环累积)。
         self._procs.pop(pid, None)
+        self._ps.pop(pid, None)
+        if (job := self._jobs.pop(pid, None)) is not None:
+            _close_job(job)
         self._exit_cbs.pop(pid, None)
-        self._readers.pop(pid, None)
         self._wait_tasks.pop(pid, None)
 
     def on_exit(self, pid: int, cb: Callable[[int], None]) -> None:
         self._exit_cbs[pid] = cb
 
     def alive(self, pid: int) -> bool:
+        """ensure_running 每请求经 _reconcile 调用:自有子进程走快路径(_wait 的 wait()
+        退出即回填 returncode,纯属性读,无 /proc 读);非自有 pid 才回退 psutil。"""
+        popen = self._procs.get(pid)
+        if popen is not None:
+            return popen.returncode is None
         try:
-            p = psutil.Process(pid)
+            p = self._ps.get(pid) or psutil.Process(pid)
             return p.status() != psutil.STATUS_ZOMBIE and p.is_running()
         except psutil.NoSuchProcess:
             return False
         except Exception:  # noqa: BLE001
             return False
 
+    def _snapshot_tree(self, pid: int) -> list[psutil.Process] | None:
+        """kill 前快照整棵树(首进程 + 递归后代);首进程已不在 → None。"""
+        try:
+            leader = self._ps.get(pid) or psutil.Process(pid)
+            return [leader, *leader.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return None
+
     async def kill_tree(self, pid: int) -> bool:
         try:
+            job = self._jobs.pop(pid, None)
+            if job is not None:
+                # 先快照全树再 TerminateJobObject;返回前等其全部退出(上限 3s),
+                # 否则驱逐后立即重读显存会读到尚未释放的旧值。未退净 → 落入下方回退。
+                tree = self._snapshot_tree(pid)
+                if _terminate_job(job) and (tree is None or await _wait_gone(tree, timeout=3)):
+                    return True
+            popen = self._procs.get(pid)
+            if os.name != "nt" and popen is not None and popen.returncode is None:
+                # 自有子进程经 start_new_session 为会话首进程(pgid == pid):一次 killpg 杀整组。
+                # killpg 前快照全树:自行 setsid 脱组的后代逐个补杀;等待覆盖全树(vLLM/lmdeploy
+                # 的 worker 子进程仍持显存),全部退出才返回 True。未退净 → 落入下方回退。
+                tree = self._snapshot_tree(pid)
+                if tree is not None:
+                    strays = [p for p in tree if _pgid(p.pid) not in (pid, None)]
+                    try:
+                        os.killpg(pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+                    for p in strays:
+                        try:
+                            p.kill()
+                        except psutil.NoSuchProcess:
+                            pass
+                    if await _wait_gone(tree, timeout=3):
+                        return True
             try:
-                parent = psutil.Process(pid)
+                parent = self._ps.get(pid) or psutil.Process(pid)
                 children = parent.children(recursive=True)
                 for c in children:
                     try:
@@ -155,8 +379,7 @@ class Supervisor:
                     except psutil.NoSuchProcess:
                         pass
                 parent.kill()
-                _, alive = psutil.wait_procs([parent] + children, timeout=3)
-                if not alive:
+                if await _wait_gone([parent, *children], timeout=3):
                     return True
             except psutil.NoSuchProcess:
                 return True
@@ -182,7 +405,7 @@ class Supervisor:
                 except Exception:  # noqa: BLE001
                     return False
         finally:
-            # 三张表 _procs/_exit_cbs/_readers 不随 start/stop 循环累积(_wait 自清 _wait_tasks;双路径幂等)
+            # _procs/_ps/_exit_cbs 不随 start/stop 循环累积(_wait 自清 _wait_tasks;双路径幂等)
             self._procs.pop(pid, None)
+            self._ps.pop(pid, None)
             self._exit_cbs.pop(pid, None)
-            self._readers.pop(pid, None)
@@ -4,7 +4,9 @@ Claude Code's settings.json nests environment variables under ``data["env"]``
 (not at the top level). ``apply_preset`` writes preset keys there while
 preserving all other top-level and env keys; ``detect_current_preset`` reads the
 current ``ANTHROPIC_BASE_URL`` and matches it against configured presets so the
-tray submenu can mark the active one.
+tray submenu can mark the active one. The parsed base URL is cached against the
+file's (mtime_ns, size): pystray evaluates ``checked`` per preset on every menu
+render, so an unchanged file costs one ``stat`` instead of a read + JSON parse.
 """
 
 from __future__ import annotations
@@ -12,15 +14,16 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+# 单槽缓存:(路径, (mtime_ns, size)) → ANTHROPIC_BASE_URL;文件被外部改写则签名变化自动失效。
+_base_url_cache: tuple[Path, tuple[int, int], str] | None = None
+
 
 def apply_preset(settings_path: Path, preset: dict[str, str]) -> None:
     p = Path(settings_path)
-    data: dict = {}
-    if p.exists():
-        try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            data = {}
+    try:  # 不存在/不可读/损坏 → 从空对象起写(OSError 含 FileNotFoundError,免先 exists 再读)
+        data: dict = json.loads(p.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        data = {}
     env = data.get("env")
     if not isinstance(env, dict):
         env = {}
@@ -28,17 +31,32 @@ def apply_preset(settings_path: Path, preset: dict[str, str]) -> None:
     env.update(preset)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    global _base_url_cache
+    _base_url_cache = None  # 同一 mtime 刻度内连写时签名可能不变,显式失效
 
 
-def detect_current_preset(settings_path: Path, presets: dict[str, dict[str, str]]) -> str:
-    p = Path(settings_path)
-    if not p.exists():
-        return "(未知)"
+def _current_base_url(p: Path) -> str:
+    """settings.json 的 env.ANTHROPIC_BASE_URL;不存在/不可解析 → ""。按 stat 签名缓存。"""
+    global _base_url_cache
+    try:
+        st = p.stat()
+    except OSError:
+        return ""
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _base_url_cache
+    if cached is not None and cached[0] == p and cached[1] == sig:
+        return cached[2]
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
+        base_url = (data.get("env") or {}).get("ANTHROPIC_BASE_URL", "")
     except (json.JSONDecodeError, OSError):
-        return "(未知)"
-    base_url = (data.get("env") or {}).get("ANTHROPIC_BASE_URL", "")
+        base_url = ""
+    _base_url_cache = (p, sig, base_url)
+    return base_url
+
+
+def detect_current_preset(settings_path: Path, presets: dict[str, dict[str, str]]) -> str:
+    base_url = _current_base_url(Path(settings_path))
     if not base_url:
         return "(未知)"
     for name, preset in presets.items():
@@ -4,13 +4,24 @@ create_app() 调用 setup_logging(),它每次启动挂一个时间戳文件
 logs/llm-manager_{ts}.log(保留最近 10 个)到 root logger。不加隔离:
 每个建 app 的测试都会把 pytest 输出混进生产日志文件,真实 app 运行时
 也 append 同一批文件。Stub setup_logging 整个套件,测试永不触碰真实日志文件。
+
+usage 组提交队列是事件循环内的模块单例;每个测试(各自的 asyncio.run / TestClient loop)
+换一份干净队列,避免上个 loop 关闭时遗留的 drain 任务卡住后续入队。
 """
 
 import pytest
 
 from llm_manager import app
+from llm_manager.data import usage
 
 
 @pytest.fixture(autouse=True)
 def _isolate_logging(monkeypatch):
     monkeypatch.setattr(app, "setup_logging", lambda *a, **k: None)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_usage_queue(monkeypatch):
+    monkeypatch.setattr(usage, "_usage_queue", [])
+    monkeypatch.setattr(usage, "_usage_next", None)
+    monkeypatch.setattr(usage, "_usage_drain", None)
@@ -41,7 +41,7 @@ def test_capture_flush_persists_and_broadcasts(store):
         q = logs.subscribe(sid)
         logs.capture("m1", "hello", "out")
         await logs.flush()  # 落库后广播(广播行=DB 行,带全局 id)
-        line = await asyncio.wait_for(q.get(), timeout=1.0)
+        (line,) = await asyncio.wait_for(q.get(), timeout=1.0)  # 每次 flush 整批一条
         received.append(line)
         logs.unsubscribe(sid, q)
 
@@ -120,6 +120,74 @@ def test_concurrent_writes_serialized_by_lock(tmp_path):
     assert n == 80
 
 
+def test_record_usage_grouped_coalesces_concurrent_rows(tmp_path, monkeypatch):
+    import asyncio
+
+    from llm_manager.data import usage as _u
+
+    db = open_db(tmp_path / "t.db")
+    calls = []
+    real = _u.record_usage_many
+    monkeypatch.setattr(
+        _u, "record_usage_many", lambda d, rows: (calls.append(len(rows)), real(d, rows))
+    )
+
+    async def main():
+        rows = [("M", 0.0, 0.1, i, 1, 0, i) for i in range(20)]
+        await asyncio.gather(*[_u.record_usage_grouped(db, r) for r in rows])
+
+    asyncio.run(main())
+    assert calls == [20]  # 同轮到达 → 一次 executemany + 一次 commit
+    n = db.conn.execute("SELECT COUNT(*) AS n FROM model_requests").fetchone()["n"]
+    assert n == 20
+
+
+def test_flush_usage_drains_rows_whose_callers_were_cancelled(tmp_path):
+    """关停兜底:入队后调用方被取消(客户端断开),flush_usage 仍等到该行落库。"""
+    import asyncio
+
+    from llm_manager.data import usage as _u
+
+    db = open_db(tmp_path / "t.db")
+
+    async def main():
+        task = asyncio.create_task(_u.record_usage_grouped(db, ("M", 0.0, 0.1, 1, 1, 0, 1)))
+        await asyncio.sleep(0)  # 入队 + 起 drain
+        task.cancel()
+        await _u.flush_usage()
+        assert _u._usage_drain is None
+
+    asyncio.run(main())
+    n = db.conn.execute("SELECT COUNT(*) AS n FROM model_requests").fetchone()["n"]
+    assert n == 1
+
+
+def test_abandoned_usage_batch_failure_logged_once(tmp_path, monkeypatch, caplog):
+    """同批调用方全部取消后落库失败:drain 恰记一次 warning,无 asyncio 未取走异常报错。"""
+    import asyncio
+    import gc
+    import logging
+
+    from llm_manager.data import usage as _u
+
+    def boom(db, rows):
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(_u, "record_usage_many", boom)
+    db = open_db(tmp_path / "t.db")
+
+    async def main():
+        task = asyncio.create_task(_u.record_usage_grouped(db, ("M", 0.0, 0.1, 1, 1, 0, 1)))
+        await asyncio.sleep(0)  # 入队 + 起 drain
+        task.cancel()
+        await _u.flush_usage()
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(main())
+        gc.collect()  # 未取走异常的 Future 在析构时经 asyncio logger 上报
+    assert [r.getMessage() for r in caplog.records] == ["usage batch write failed (1 rows)"]
+
+
 def test_usage_series_buckets_per_model_and_total(tmp_path):
     db = open_db(tmp_path / "t.db")
     # bucket=60, range [0,120) → buckets [0, 60]; the time key is end_time
@@ -286,7 +354,7 @@ def test_record_runtime_end_closes_by_segment_id(tmp_path):
         "SELECT start_time, end_time FROM model_runtime r JOIN models m ON r.model_id=m.id "
         "WHERE m.original_name='m1' ORDER BY start_time"
     ).fetchall()
-    assert rows[0]["end_time"] is None  # seg1 仍开
+    assert rows[0]["end_time"] == 100.0  # seg1 仍开(end_time 预置为 start,待心跳推进)
     assert rows[1]["end_time"] == 300.0  # seg2 已关
     record_runtime_end(db, seg2, end=999.0)  # 幂等:seg2 已移出 _live_segments → no-op
     again = db.conn.execute("SELECT end_time FROM model_runtime WHERE id=?", (seg2,)).fetchone()
@@ -471,6 +539,36 @@ def test_usage_cost_open_session_uses_now(tmp_path):
     assert s.total_cost == 10.0
 
 
+def test_runtime_segment_orphaned_before_first_heartbeat_bills_nothing(tmp_path):
+    """首个心跳前崩溃:新进程内存无该段 → 按预置 end_time=start 收口(零时长),不按 now 无限计费。"""
+    from llm_manager.config import Pricing
+    from llm_manager.data import usage
+
+    db = open_db(tmp_path / "t.db")
+    seg = record_runtime_start(db, "m1", start=0.0)
+    usage._live_segments.discard(seg)  # 模拟进程死亡:内存态随进程消失,DB 行无人收口
+    cfg = _cfg_with(Pricing(pricing_type="hourly", hourly_price=10.0))
+    s = usage_cost(db, cfg, start_ts=0.0, end_ts=3600.0, now=3600.0)
+    assert s.total_cost == 0
+
+
+def test_usage_cost_uses_caller_live_snapshot(tmp_path):
+    """线程池调用:进行中段以调用方(事件循环上)取的 live 快照为准,不读 _live_segments。"""
+    from llm_manager.config import Pricing
+    from llm_manager.data import usage
+
+    db = open_db(tmp_path / "t.db")
+    seg = record_runtime_start(db, "m1", start=0.0)
+    usage._live_segments.discard(seg)
+    cfg = _cfg_with(Pricing(pricing_type="hourly", hourly_price=10.0))
+    s = usage_cost(db, cfg, start_ts=0.0, end_ts=3600.0, now=3600.0, live={seg})
+    assert s.total_cost == 10.0
+    series = usage.usage_cost_series(
+        db, cfg, start_ts=0.0, end_ts=3600.0, bucket_seconds=3600, now=3600.0, live={seg}
+    )
+    assert sum(series.total) == 10.0
+
+
 def test_usage_cost_free_model_yields_zero_and_is_omitted(tmp_path):
     db = open_db(tmp_path / "t.db")
     record_usage(
@@ -731,3 +829,8 @@ def test_migrate_new_fk_cascades_from_model_defs(tmp_path):
         db.conn.execute("DELETE FROM model_defs WHERE name='M'")
         db.conn.commit()
     assert db.conn.execute("SELECT COUNT(*) FROM pricing_tiers").fetchone()[0] == 0
+
+
+def test_open_db_uses_wal(tmp_path):
+    db = open_db(tmp_path / "t.db")
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
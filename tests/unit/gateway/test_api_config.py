@@ -924,3 +924,14 @@ def test_put_program_ignores_removed_log_dir_db_path(tmp_path):
     assert r.json()["needs_restart"] is False
     p = c.get("/api/config").json()["program"]
     assert "log_dir" not in p and "db_path" not in p
+
+
+def test_restart_flips_should_exit_once_response_is_sent(tmp_path):
+    app = _app(tmp_path)
+    server = types.SimpleNamespace(should_exit=False)
+    app.state.uvicorn_server = server
+    with TestClient(app) as c:
+        r = c.post("/api/config/restart")
+        assert r.status_code == 202
+        assert server.should_exit is True  # 响应发出即触发,无固定延迟
+    assert app.state.restart_requested is True
@@ -214,3 +214,22 @@ def test_session_stream_backfill_and_live(client):
 
     res = asyncio.run(go())
     assert [ll["text"] for ll in res] == ["listening", "live line"]
+
+
+def test_session_stream_burst_larger_than_queue_is_not_dropped(client):
+    _c, db, _sid_sys, sid_m = client
+
+    async def go():
+        q = _logs.subscribe(sid_m)
+        gen = _session_stream(sid_m, None, db, q)
+        try:
+            for i in range(50):  # 超过订阅队列容量(16)的一次 flush 突发
+                _logs.capture("m1", f"line {i}", "out")
+            await _logs.flush()
+            chunk = await anext(gen)  # 空回填跳过 → 直接是整批实时帧
+        finally:
+            await gen.aclose()
+        return [json.loads(f.removeprefix("data: ")) for f in chunk.split("\n\n") if f]
+
+    res = asyncio.run(go())
+    assert [ll["text"] for ll in res] == [f"line {i}" for i in range(50)]
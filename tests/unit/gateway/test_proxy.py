@@ -179,7 +179,7 @@ def test_record_usage_best_effort_swallows_exception(monkeypatch):
         def boom(*a, **kw):
             raise sqlite3.OperationalError("disk full")
 
-        monkeypatch.setattr(usage, "record_usage", boom)
+        monkeypatch.setattr(usage, "record_usage_many", boom)
         body = b'{"usage":{"prompt_tokens":5,"completion_tokens":10}}'
         await proxy._record_usage(db, "m1", "v1/chat/completions", body, 1.0, 2.0)  # 不抛
 
@@ -199,6 +199,13 @@ def test_stream_sample_keeps_head_and_tail_drops_middle():
     assert len(out) == 32
 
 
+def test_stream_sample_oversized_chunk_keeps_exact_tail_window():
+    s = proxy._StreamSample(head_max=4, tail_max=8)
+    s.feed(b"0123456789abcdef")  # 单块 > tail_max:只取末 8 字节
+    s.feed(b"XY")
+    assert s.sample() == b"0123" + b"89abcdefXY"[-8:]
+
+
 def test_stream_sample_small_stream_returns_head_only_no_dup():
     s = proxy._StreamSample(head_max=64, tail_max=64)
     s.feed(b"abcdef")
@@ -271,7 +278,7 @@ async def test_stream_wrapper_forwards_chunks_records_usage_ends_request():
 
 
 # ---------- forward ----------
-def _make_request(method, path, json_body, content_type="application/json"):
+def _make_request(method, path, json_body, content_type="application/json", query=b""):
     from starlette.requests import Request as StarletteRequest
 
     body = json.dumps(json_body).encode() if json_body is not None else b""
@@ -280,7 +287,7 @@ def _make_request(method, path, json_body, content_type="application/json"):
         "method": method,
         "path": path.split("/"),
         "raw_path": path.encode(),
-        "query_string": b"",
+        "query_string": query,
         "headers": [(b"content-type", content_type.encode()), (b"host", b"x")]
         + ([(b"content-length", str(len(body)).encode())] if body else []),
     }
@@ -353,6 +360,26 @@ async def test_forward_stream_returns_streaming_and_records_on_consume():
     await client.aclose()
 
 
+async def test_forward_passes_original_bytes_when_body_unchanged():
+    state._reset()
+    seen: list[bytes] = []
+
+    def handler(req):
+        seen.append(req.content)
+        return httpx.Response(200, json={}, headers={"content-type": "application/json"})
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    for body in ({"model": "m1", "x": 1}, {"model": "alias1", "x": 1}):
+        req = _make_request("POST", "v1/chat/completions", body)
+        await proxy.forward(req, "v1/chat/completions", FakeLifecycle(), _cfg(), db, {8000: client})
+    assert seen[0] == json.dumps({"model": "m1", "x": 1}).encode()  # 主别名 → 原字节直发
+    assert json.loads(seen[1]) == {"model": "m1", "x": 1}  # 次别名 → 改写为主别名
+    await client.aclose()
+
+
 async def test_forward_ensure_running_failed_returns_503():
     state._reset()
     client = httpx.AsyncClient(
@@ -436,7 +463,7 @@ async def test_forward_record_usage_failure_does_not_pollute_passthrough(monkeyp
     def boom(*a, **kw):
         raise sqlite3.OperationalError("boom")
 
-    monkeypatch.setattr(usage, "record_usage", boom)
+    monkeypatch.setattr(usage, "record_usage_many", boom)
 
     def handler(req):
         return httpx.Response(
@@ -459,3 +486,117 @@ async def test_forward_record_usage_failure_does_not_pollute_passthrough(monkeyp
     assert resp.status_code == 200  # 透传,非 500
     assert state.pending_count("m1") == 0
     await client.aclose()
+
+
+async def test_forward_skips_usage_parse_for_non_json_body(monkeypatch):
+    from llm_manager.data import metering
+
+    state._reset()
+    parsed = []
+    monkeypatch.setattr(metering, "parse_tokens", lambda *a: parsed.append(a))
+
+    def handler(req):
+        return httpx.Response(200, content=b"RIFF....", headers={"content-type": "audio/wav"})
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    req = _make_request("POST", "v1/audio/speech", {"model": "m1"})
+    resp = await proxy.forward(req, "v1/audio/speech", FakeLifecycle(), _cfg(), db, {8000: client})
+    assert resp.status_code == 200 and resp.body == b"RIFF...."
+    assert parsed == []  # 二进制体不进 metering
+    assert state.pending_count("m1") == 0
+    await client.aclose()
+
+
+@pytest.mark.parametrize("content_type", ["text/plain; charset=utf-8", None])
+async def test_forward_meters_usage_without_json_content_type(content_type):
+    """上游用量体未标 JSON(text/plain 装 SSE 体 / 缺省 content-type)仍计量。"""
+    state._reset()
+    sse = b'data: {"usage": {"prompt_tokens": 4, "completion_tokens": 6}}\n\ndata: [DONE]\n\n'
+
+    def handler(req):
+        headers = {"content-type": content_type} if content_type else {}
+        return httpx.Response(200, content=sse, headers=headers)
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    req = _make_request("POST", "v1/chat/completions", {"model": "m1"})
+    resp = await proxy.forward(
+        req, "v1/chat/completions", FakeLifecycle(), _cfg(), db, {8000: client}
+    )
+    assert resp.status_code == 200 and resp.body == sse
+    row = db.conn.execute("SELECT input_tokens, output_tokens FROM model_requests").fetchone()
+    assert tuple(row) == (4, 6)
+    await client.aclose()
+
+
+async def test_forward_cancelled_upstream_send_releases_pending():
+    state._reset()
+
+    def handler(req):
+        raise asyncio.CancelledError  # 客户端断开 → 转发中途被取消
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    req = _make_request("POST", "v1/chat/completions", {"model": "m1"})
+    with pytest.raises(asyncio.CancelledError):
+        await proxy.forward(req, "v1/chat/completions", FakeLifecycle(), _cfg(), db, {8000: client})
+    assert state.pending_count("m1") == 0  # finally 收口,取消不泄漏 pending
+    await client.aclose()
+
+
+async def test_forward_non_stream_raw_headers_passthrough():
+    state._reset()
+
+    def handler(req):
+        return httpx.Response(
+            200,
+            content=b"{}",
+            headers=[
+                ("Content-Type", "application/json"),
+                ("Set-Cookie", "a=1"),
+                ("Set-Cookie", "b=2"),
+                ("Connection", "keep-alive"),
+                ("Content-Length", "999"),
+            ],
+        )
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    req = _make_request("POST", "v1/chat/completions", {"model": "m1"})
+    resp = await proxy.forward(
+        req, "v1/chat/completions", FakeLifecycle(), _cfg(), db, {8000: client}
+    )
+    raw = resp.raw_headers
+    assert (b"content-length", b"2") in raw  # 按实际体长重算,上游值被剥离
+    assert [v for k, v in raw if k == b"set-cookie"] == [b"a=1", b"b=2"]  # 多值不合并
+    assert all(k != b"connection" for k, _ in raw)
+    assert resp.headers["content-type"] == "application/json"
+    await client.aclose()
+
+
+async def test_forward_passes_query_string_verbatim():
+    state._reset()
+    seen = []
+
+    def handler(req):
+        seen.append(req.url.query)
+        return httpx.Response(200, json={}, headers={"content-type": "application/json"})
+
+    client = httpx.AsyncClient(
+        base_url="http://127.0.0.1:8000", transport=httpx.MockTransport(handler)
+    )
+    db = open_db(Path(":memory:"))
+    for q in (b"a=1&a=2&b=x", b""):
+        req = _make_request("POST", "v1/chat/completions", {"model": "m1"}, query=q)
+        await proxy.forward(req, "v1/chat/completions", FakeLifecycle(), _cfg(), db, {8000: client})
+    assert seen == [b"a=1&a=2&b=x", b""]  # 多值键保留;空查询不附加 '?'
+    await client.aclose()
@@ -133,6 +133,26 @@ def test_spa_served_and_api_unaffected_when_dist_exists(tmp_path, monkeypatch):
         assert c.get("/assets/app.js").status_code == 200  # 静态资源
 
 
+def test_spa_hashed_assets_immutable_and_shell_revalidated(tmp_path, monkeypatch):
+    """assets/(内容哈希文件名)永久缓存;index.html 每次 ETag 协商,未变 → 304。"""
+    import llm_manager.gateway.spa as spa_mod
+
+    fake_dist = tmp_path / "dist"
+    (fake_dist / "assets").mkdir(parents=True)
+    (fake_dist / "assets" / "index-abc123.js").write_text("console.log(1)", encoding="utf-8")
+    (fake_dist / "index.html").write_text("<html>SPA</html>", encoding="utf-8")
+    monkeypatch.setattr(spa_mod, "_FRONTEND_DIST", fake_dist)
+    app = FastAPI()
+    _register(app, _cfg(tmp_path))
+    with TestClient(app) as c:
+        asset = c.get("/assets/index-abc123.js")
+        assert "immutable" in asset.headers["cache-control"]
+        shell = c.get("/")
+        assert shell.headers["cache-control"] == "no-cache"
+        again = c.get("/", headers={"If-None-Match": shell.headers["etag"]})
+        assert again.status_code == 304
+
+
 def test_spa_rejects_path_traversal(tmp_path, monkeypatch):
     """路径穿越防御:GET /%2e%2e/... 必须返回 404,不能读 dist 外的文件。"""
     import llm_manager.gateway.spa as spa_mod
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+from llm_manager.data import logs, usage
+from llm_manager.data.persistence import open_db
+from llm_manager.runtime import heartbeat
+
+
+def test_heartbeat_writes_off_loop_and_skips_when_idle(tmp_path, monkeypatch):
+    db = open_db(tmp_path / "t.db")
+    threads: list[str] = []
+    real_beat = heartbeat._beat
+
+    def spy(*args):
+        threads.append(threading.current_thread().name)
+        real_beat(*args)
+
+    monkeypatch.setattr(heartbeat, "_beat", spy)
+    monkeypatch.setattr(logs, "_sessions", {})  # 隔离其它用例残留的进行中会话/段
+    monkeypatch.setattr(usage, "_live_segments", set())
+
+    async def run(seconds: float) -> None:
+        stop = asyncio.Event()
+        task = asyncio.create_task(heartbeat.heartbeat_loop(db, stop, interval=0.02))
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(run(0.1))
+    assert threads == []  # 无进行中会话/段 → 零写入
+
+    seg = usage.record_runtime_start(db, "m1", start=100.0)
+    try:
+        asyncio.run(run(0.1))
+    finally:
+        usage.record_runtime_end(db, seg, end=200.0)
+    assert threads and threading.main_thread().name not in threads  # 落库在工作线程
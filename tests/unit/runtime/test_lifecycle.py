@@ -113,7 +113,7 @@ def _cfg(*models):
     )
 
 
-def _ok_probe(alias, port, start_time=None, timeout=60):
+def _ok_probe(alias, port, start_time=None, timeout=60, cancel=None):
     return ProbeResult(True, "ok")
 
 
@@ -234,7 +234,7 @@ async def test_single_dispatch_concurrent_start_spawns_once():
 
 
 async def test_stop_starting_winner_self_terminates_no_routing():
-    def slow_probe(alias, port, start_time=None, timeout=60):
+    def slow_probe(alias, port, start_time=None, timeout=60, cancel=None):
         _time.sleep(0.15)
         return ProbeResult(False, "slow")
 
@@ -247,12 +247,28 @@ async def test_stop_starting_winner_self_terminates_no_routing():
     assert state.get_status("m1") == ModelStatus.STOPPED
 
 
+async def test_stop_cancels_running_probe_thread():
+    seen: list[bool] = []
+
+    def waiting_probe(alias, port, start_time=None, timeout=60, cancel=None):
+        seen.append(cancel.wait(5))  # stop 置位 → 立即返回 True
+        return ProbeResult(False, "cancelled")
+
+    life, _sup, _, _ = _make(probes={"Chat": waiting_probe})
+    task = asyncio.create_task(life.ensure_running("m1"))
+    await asyncio.sleep(0.05)
+    await life.stop("m1")
+    assert await asyncio.wait_for(task, 2) == ModelStatus.STOPPED
+    assert seen == [True]
+    assert life._probe_cancels == {}
+
+
 async def test_slow_probe_then_concurrent_restart_not_clobbered():
     """Blocker B: orphan winner stuck in un-interruptible probe, stop pops its
     inflight, a CONCURRENT ensure_running re-claims. Orphan winner's later
     finish_start(STOPPED) must NOT clobber the new winner (owner-token guard)."""
 
-    def slow_probe(alias, port, start_time=None, timeout=60):
+    def slow_probe(alias, port, start_time=None, timeout=60, cancel=None):
         _time.sleep(0.3)
         return ProbeResult(True, "ok")
 
@@ -298,7 +314,7 @@ async def test_insufficient_resource_marks_failed():
 
 
 async def test_probe_failure_marks_failed():
-    def bad_probe(alias, port, start_time=None, timeout=60):
+    def bad_probe(alias, port, start_time=None, timeout=60, cancel=None):
         return ProbeResult(False, "unhealthy")
 
     life, sup, _, _ = _make(probes={"Chat": bad_probe})
@@ -308,7 +324,7 @@ async def test_probe_failure_marks_failed():
 
 
 async def test_probe_timeout_marks_failed():
-    def timeout_probe(alias, port, start_time=None, timeout=60):
+    def timeout_probe(alias, port, start_time=None, timeout=60, cancel=None):
         _time.sleep(0.1)
         return ProbeResult(False, "探测器深层检查超时")
 
@@ -318,7 +334,7 @@ async def test_probe_timeout_marks_failed():
 
 
 async def test_probe_raising_after_spawn_kills_pid_then_failed():
-    def raising_probe(alias, port, start_time=None, timeout=60):
+    def raising_probe(alias, port, start_time=None, timeout=60, cancel=None):
         raise RuntimeError("probe blew up")
 
     life, sup, _, _ = _make(probes={"Chat": raising_probe})
@@ -421,7 +437,7 @@ async def test_ensure_running_cancelled_after_spawn_kills_pid_clears_slot():
     """cancel-safe:ensure_running 被 cancel 落在 post-spawn 阶段(spawn 后 probe 中)→
     kill_tree 被调(无孤儿)+ finish_start 清 slot(状态 FAILED、inflight 释放)+ CancelledError 传播。"""
 
-    def slow_probe(alias, port, start_time=None, timeout=60):
+    def slow_probe(alias, port, start_time=None, timeout=60, cancel=None):
         _time.sleep(0.3)
         return ProbeResult(True, "ok")
 
@@ -643,9 +659,9 @@ async def test_runtime_session_recorded_on_start_and_stop(tmp_path):
     await life.ensure_running("m1")  # → ROUTING → runtime start
     open_rows = db.conn.execute(
         "SELECT COUNT(*) AS n FROM model_runtime r JOIN models m ON r.model_id=m.id "
-        "WHERE m.original_name='m1' AND r.end_time IS NULL"
+        "WHERE m.original_name='m1' AND r.end_time = r.start_time"
     ).fetchone()
-    assert open_rows["n"] == 1
+    assert open_rows["n"] == 1  # 进行中:end_time 预置为 start,待心跳推进
     await life.stop("m1")  # → runtime end
     closed = db.conn.execute(
         "SELECT end_time FROM model_runtime r JOIN models m ON r.model_id=m.id "
@@ -693,12 +709,12 @@ async def test_runtime_session_closed_on_reconcile_dead(tmp_path):
     status = await life.ensure_running("m1")  # reconcile → _runtime_end → restart
     assert status == ModelStatus.ROUTING
     rows = db.conn.execute(
-        "SELECT end_time FROM model_runtime r JOIN models m ON r.model_id=m.id "
+        "SELECT start_time, end_time FROM model_runtime r JOIN models m ON r.model_id=m.id "
         "WHERE m.original_name='m1' ORDER BY r.id"
     ).fetchall()
     assert len(rows) == 2  # old closed + new open
     assert rows[0]["end_time"] is not None
-    assert rows[1]["end_time"] is None
+    assert rows[1]["end_time"] == rows[1]["start_time"]  # 新段:end_time 预置为 start
 
 
 # ---------- Task 5: model log sessions (DB-backed) ----------
@@ -1,4 +1,3 @@
-import sys
 import time
 
 import pytest
@@ -28,15 +27,32 @@ def test_lifespan_starts_and_stops_background(tmp_path, monkeypatch):
     monkeypatch.setattr("llm_manager.devices.common.is_lhm_available", lambda: False)
     # 探针秒失败(跳过真实 60s 重试循环):仍证明 auto_start 后台真起 + 失败容错(不抛)+ 不阻塞 /health。
     # 测试的真实契约是「后台任务起 + 失败路径走通 + /health 不阻塞」,「重试 60s」只是 startup_timeout 的副作用。
+    import json
+    import sys
+
+    from llm_manager.devices import DeviceInfo
     from llm_manager.probes import ProbeResult, probe_registry
 
+    # 方案要求 rtx 4060:桩一个在线 4060,测试不依赖本机显卡;命令换成真实常驻进程
+    # (nonexistent.cmd 在 POSIX 上 spawn 即失败,根本走不到探针)。
+    class _Rtx4060:
+        def enumerate(self):
+            return [
+                DeviceInfo("NVIDIA GeForce RTX 4060", "GPU", "VRAM", 8192, 8000, 192, 2.0, None)
+            ]
+
+    monkeypatch.setattr("llm_manager.app.build_adapters", lambda: [_Rtx4060()])
+
     monkeypatch.setitem(
         probe_registry,
         "Chat",
-        lambda alias, port, start_time=None, timeout=300: ProbeResult(False, "test fast-fail"),
+        lambda alias, port, start_time=None, timeout=300, cancel=None: ProbeResult(
+            False, "test fast-fail"
+        ),
     )
+    cmd = f'{{exe: {json.dumps(sys.executable)}, args: ["-c", "import time; time.sleep(30)"]}}'
     cfg_path = tmp_path / "config.yaml"
-    cfg_path.write_text(_CFG_BODY, encoding="utf-8")
+    cfg_path.write_text(_CFG_BODY.replace('{exe: "nonexistent.cmd"}', cmd), encoding="utf-8")
     app = create_app(db_path=tmp_path / "t.db", legacy_yaml=cfg_path)
     with TestClient(app) as c:
         assert c.get("/health").status_code == 200  # fire-and-forget:就绪不等 auto_start
@@ -44,9 +60,33 @@ def test_lifespan_starts_and_stops_background(tmp_path, monkeypatch):
         while time.monotonic() < deadline and state.get_status("m1") != ModelStatus.FAILED:
             time.sleep(0.05)
         assert state.get_status("m1") == ModelStatus.FAILED
+        # 走的是探针失败路径(而非签名不符 TypeError 落入通用 pipeline 异常)
+        assert "test fast-fail" in (state.get_failure_reason("m1") or "")
     # with 退出 → lifespan finally:stop_event.set() + unload_all + cancel+gather,干净关闭无异常
 
 
+def test_lifespan_ready_without_waiting_for_first_device_sampling(tmp_path, monkeypatch):
+    """首轮设备采样(秒级)转后台:lifespan 就绪 /health 可用时采样仍可在进行中。"""
+    import threading
+
+    release = threading.Event()
+
+    class _SlowAdapter:
+        def enumerate(self):
+            release.wait(5)
+            return []
+
+    monkeypatch.setattr("llm_manager.app.build_adapters", lambda: [_SlowAdapter()])
+    app = create_app(db_path=tmp_path / "t.db")
+    try:
+        t0 = time.monotonic()
+        with TestClient(app) as c:
+            assert c.get("/health").status_code == 200
+            assert time.monotonic() - t0 < 2  # 未等慢采样
+    finally:
+        release.set()
+
+
 def test_create_app_warm_start_skips_import(tmp_path):
     """同库二次 create_app(无 legacy_yaml)→ 已 initialized → 跳过导入,保留 DB 状态。"""
     cfg_path = tmp_path / "config.yaml"
@@ -147,173 +187,3 @@ def test_exit_code_for_returns_sentinel_only_when_requested():
 
     assert exit_code_for(False) == 0
     assert exit_code_for(True) == RESTART_EXIT_CODE == 81
-
-
-# ---------- parent 监督器辅助(Task 1) ----------
-
-
-def test_should_respawn_only_on_restart_sentinel():
-    from llm_manager.app import RESTART_EXIT_CODE, _should_respawn
-
-    assert _should_respawn(RESTART_EXIT_CODE) is True
-    assert _should_respawn(0) is False
-    assert _should_respawn(1) is False
-    assert _should_respawn(None) is False
-    assert _should_respawn(-9) is False
-
-
-def test_worker_command_contains_executable_and_flag():
-    from llm_manager.app import _WORKER_FLAG, _worker_command
-
-    cmd = _worker_command()
-    assert cmd[0] == sys.executable
-    assert "-m" in cmd and "llm_manager" in cmd
-    assert _WORKER_FLAG in cmd
-
-
-def test_spawn_kwargs_windows_uses_process_group(monkeypatch):
-    import subprocess
-
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "nt")
-    kw = appmod._spawn_kwargs()
-    assert kw["creationflags"] == subprocess.CREATE_NEW_PROCESS_GROUP
-
-
-def test_spawn_kwargs_posix_uses_new_session(monkeypatch):
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "posix")
-    kw = appmod._spawn_kwargs()
-    assert kw["start_new_session"] is True
-    assert "creationflags" not in kw
-
-
-# ---------- 信号转发辅助(Task 2) ----------
-
-
-def test_forwardable_signals_per_os(monkeypatch):
-    import signal as _sig
-
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "nt")
-    assert appmod._forwardable_signals() == [_sig.SIGINT]
-    monkeypatch.setattr(appmod.os, "name", "posix")
-    sigs = appmod._forwardable_signals()
-    assert _sig.SIGINT in sigs and _sig.SIGTERM in sigs
-
-
-def test_send_shutdown_windows_sends_ctrl_break(monkeypatch):
-    import signal as _sig
-
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "nt")
-    sent = {}
-
-    class FakeProc:
-        pid = 123
-
-        def send_signal(self, s):
-            sent["sig"] = s
-
-    appmod._send_shutdown(FakeProc())
-    assert sent["sig"] == _sig.CTRL_BREAK_EVENT
-
-
-def test_send_shutdown_posix_killpg(monkeypatch):
-    import signal as _sig
-
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "posix")
-    killed = {}
-    # getpgid/killpg 在 Windows 不存在,raising=False 允许注入以测 POSIX 分支
-    monkeypatch.setattr(appmod.os, "getpgid", lambda pid: 999, raising=False)
-    monkeypatch.setattr(
-        appmod.os,
-        "killpg",
-        lambda pgid, sig: killed.__setitem__("args", (pgid, sig)),
-        raising=False,
-    )
-
-    class FakeProc:
-        pid = 123
-
-    appmod._send_shutdown(FakeProc())
-    assert killed["args"] == (999, _sig.SIGTERM)
-
-
-def test_send_shutdown_missing_process_is_silent(monkeypatch):
-    import llm_manager.app as appmod
-
-    monkeypatch.setattr(appmod.os, "name", "posix")
-
-    def _raise_ple(pid):
-        raise ProcessLookupError()
-
-    # getpgid 抛 ProcessLookupError → 应被 _send_shutdown 吞掉。
-    # killpg 仅作占位使其属性可解析(实际不会被调用:getpgid 先抛)。
-    monkeypatch.setattr(appmod.os, "getpgid", _raise_ple, raising=False)
-    monkeypatch.setattr(appmod.os, "killpg", lambda *a: None, raising=False)
-
-    class FakeProc:
-        pid = 123
-
-    appmod._send_shutdown(FakeProc())  # 不抛
-
-
-def test_force_kill_when_still_running():
-    import llm_manager.app as appmod
-
-    killed = {}
-
-    class FakeProc:
-        def poll(self):
-            return None  # 仍运行
-
-        def kill(self):
-            killed["killed"] = True
-
-    appmod._force_kill(FakeProc())
-    assert killed.get("killed") is True
-
-
-def test_force_kill_noop_when_exited():
-    import llm_manager.app as appmod
-
-    class FakeProc:
-        def poll(self):
-            return 0  # 已退出
-
-        def kill(self):
-            raise AssertionError("不应 kill 已退出的进程")
-
-    appmod._force_kill(FakeProc())
-
-
-# ---------- 入口分派(Task 3) ----------
-
-
-def test_main_dispatches_to_worker_when_flag(monkeypatch):
-    import llm_manager.app as appmod
-
-    called = {}
-    monkeypatch.setattr(appmod, "_run_worker", lambda: called.__setitem__("w", True))
-    monkeypatch.setattr(appmod, "_run_parent", lambda: called.__setitem__("p", True))
-    monkeypatch.setattr(appmod.sys, "argv", ["llm_manager", "--worker"])
-    appmod.main()
-    assert called == {"w": True}
-
-
-def test_main_dispatches_to_parent_by_default(monkeypatch):
-    import llm_manager.app as appmod
-
-    called = {}
-    monkeypatch.setattr(appmod, "_run_worker", lambda: called.__setitem__("w", True))
-    monkeypatch.setattr(appmod, "_run_parent", lambda: called.__setitem__("p", True))
-    monkeypatch.setattr(appmod.sys, "argv", ["llm_manager"])
-    appmod.main()
-    assert called == {"p": True}
@@ -212,6 +212,31 @@ def _prog(**kw):
     return ProgramConfig(**base)
 
 
+def test_resolve_alias_index_follows_new_snapshot():
+    def mk(aliases):
+        return AppConfig(
+            program=ProgramConfig(host="0.0.0.0", port=8080, alive_time=60, log_level="INFO"),
+            models={"M": ModelConfig("M", aliases, "Chat", 1)},
+            wol=None,
+            claude_configs={},
+        )
+
+    from dataclasses import replace
+
+    old = mk(("M", "old"))
+    assert resolve_alias(old, "old") == "M"
+    # mutate_appconfig 经 dataclasses.replace 出新快照 → 索引随之重建,旧快照索引不变
+    new = replace(old, models={"M": ModelConfig("M", ("M", "new"), "Chat", 1)})
+    assert resolve_alias(new, "new") == "M"
+    assert resolve_alias(old, "old") == "M"
+    for bad in ("old", ["M"]):
+        try:
+            resolve_alias(new, bad)
+            assert False, "expected KeyError"
+        except KeyError:
+            pass
+
+
 def test_validate_rejects_empty_alias_and_intra_model_duplicate():
     # 同一模型内重复别名 → "duplicate alias"(非跨模型 "shared by")
     cfg = AppConfig(
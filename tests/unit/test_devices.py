@@ -143,6 +143,14 @@ def test_tokens_splits_alnum():
     assert _tokens("") == set()
 
 
+def test_tokens_cached_and_immutable():
+    from llm_manager.devices import _tokens
+
+    a = _tokens("NVIDIA GeForce RTX 4090")
+    assert _tokens("NVIDIA GeForce RTX 4090") is a  # 重复拆分命中缓存
+    assert isinstance(a, frozenset)  # 共享结果不可被调用方改写
+
+
 def _di(name):
     """测试用 DeviceInfo 构造器(仅 device_name 重要,其余置零)。"""
     from llm_manager.devices import DeviceInfo
@@ -1018,11 +1026,26 @@ def test_run_intel_gpu_top_timeout_124_still_returns_stdout(monkeypatch):
         returncode = 124
         stdout = '[\n{"period": {"duration": 1000.0, "unit": "ms"}}\n]'
 
-    monkeypatch.setattr(ad.shutil, "which", lambda _: "/usr/bin/intel_gpu_top")
+    monkeypatch.setattr(ad, "_tool_path", lambda _: "/usr/bin/intel_gpu_top")
     monkeypatch.setattr(ad.subprocess, "run", lambda *a, **k: _R())
     assert ad._run_intel_gpu_top() == _R.stdout
 
 
+def test_tool_path_resolves_each_tool_once(monkeypatch):
+    """采样工具 PATH 解析进程内缓存:每轮 refresh 不再重走 PATH(缺失工具同样缓存)。"""
+    from llm_manager.devices import common as cm
+
+    calls: list[str] = []
+    monkeypatch.setattr(cm.shutil, "which", lambda n: calls.append(n) or None)
+    cm._tool_path.cache_clear()
+    try:
+        assert cm._tool_path("intel_gpu_top") is None
+        assert cm._tool_path("intel_gpu_top") is None
+        assert calls == ["intel_gpu_top"]
+    finally:
+        cm._tool_path.cache_clear()
+
+
 def test_run_intel_gpu_top_real_failure_returns_none(monkeypatch):
     # 真失败(工具自身报错)≠ timeout:returncode=1 → None,指标降级
     from llm_manager.devices import intel as ad
@@ -1031,7 +1054,7 @@ def test_run_intel_gpu_top_real_failure_returns_none(monkeypatch):
         returncode = 1
         stdout = ""
 
-    monkeypatch.setattr(ad.shutil, "which", lambda _: "/usr/bin/intel_gpu_top")
+    monkeypatch.setattr(ad, "_tool_path", lambda _: "/usr/bin/intel_gpu_top")
     monkeypatch.setattr(ad.subprocess, "run", lambda *a, **k: _R())
     assert ad._run_intel_gpu_top() is None
 
@@ -1303,3 +1326,49 @@ def test_amd_adapter_linux_missing_sysfs_returns_empty(monkeypatch, tmp_path):
     monkeypatch.setattr(ad, "_DRM_CLASS", missing)
     monkeypatch.setattr(cm, "_DRM_CLASS", missing)
     assert ad.AmdAdapter().enumerate() == []
+
+
+def test_run_io_serializes_on_dedicated_devices_thread():
+    import asyncio
+    import threading
+
+    from llm_manager.devices import run_io
+
+    async def main():
+        return await asyncio.gather(*[run_io(lambda: threading.current_thread().name)] * 3)
+
+    names = asyncio.run(main())
+    assert len(set(names)) == 1 and names[0].startswith("devices")
+
+
+def test_run_io_coalesces_queued_calls_but_not_running_one():
+    import asyncio
+    import threading
+    import time
+
+    from llm_manager.devices import run_io
+
+    calls: list[int] = []
+    gate = threading.Event()
+
+    def blocker():
+        gate.wait(2)
+
+    def sample():
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        first = asyncio.ensure_future(run_io(blocker))  # 占住设备线程
+        await asyncio.sleep(0.05)
+        queued = [asyncio.ensure_future(run_io(sample)) for _ in range(3)]  # 同一轮排队 → 合并
+        await asyncio.sleep(0.01)
+        gate.set()
+        await first
+        results = await asyncio.gather(*queued)
+        later = await run_io(sample)  # 前一轮已结束 → 新采样
+        return results, later
+
+    results, later = asyncio.run(main())
+    assert results == [1, 1, 1] and later == 2
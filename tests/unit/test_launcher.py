@@ -0,0 +1,184 @@
+import sys
+
+# ---------- parent 监督器辅助(Task 1) ----------
+
+
+def test_should_respawn_only_on_restart_sentinel():
+    from llm_manager.launcher import RESTART_EXIT_CODE, _should_respawn
+
+    assert _should_respawn(RESTART_EXIT_CODE) is True
+    assert _should_respawn(0) is False
+    assert _should_respawn(1) is False
+    assert _should_respawn(None) is False
+    assert _should_respawn(-9) is False
+
+
+def test_worker_command_contains_executable_and_flag():
+    from llm_manager.launcher import _WORKER_FLAG, _worker_command
+
+    cmd = _worker_command()
+    assert cmd[0] == sys.executable
+    assert "-m" in cmd and "llm_manager" in cmd
+    assert _WORKER_FLAG in cmd
+
+
+def test_spawn_kwargs_windows_uses_process_group(monkeypatch):
+    import subprocess
+
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "nt")
+    kw = launcher._spawn_kwargs()
+    assert kw["creationflags"] == subprocess.CREATE_NEW_PROCESS_GROUP
+
+
+def test_spawn_kwargs_posix_uses_new_session(monkeypatch):
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "posix")
+    kw = launcher._spawn_kwargs()
+    assert kw["start_new_session"] is True
+    assert "creationflags" not in kw
+
+
+# ---------- 信号转发辅助(Task 2) ----------
+
+
+def test_forwardable_signals_per_os(monkeypatch):
+    import signal as _sig
+
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "nt")
+    nt = launcher._forwardable_signals()
+    assert nt[0] == _sig.SIGINT and _sig.SIGTERM not in nt
+    assert (getattr(_sig, "SIGBREAK", None) in nt) is hasattr(_sig, "SIGBREAK")
+    monkeypatch.setattr(launcher.os, "name", "posix")
+    sigs = launcher._forwardable_signals()
+    assert _sig.SIGINT in sigs and _sig.SIGTERM in sigs
+
+
+def test_send_shutdown_windows_sends_ctrl_break(monkeypatch):
+    import signal as _sig
+
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "nt")
+    sent = {}
+
+    class FakeProc:
+        pid = 123
+
+        def send_signal(self, s):
+            sent["sig"] = s
+
+    launcher._send_shutdown(FakeProc())
+    assert sent["sig"] == _sig.CTRL_BREAK_EVENT
+
+
+def test_send_shutdown_posix_killpg(monkeypatch):
+    import signal as _sig
+
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "posix")
+    killed = {}
+    # getpgid/killpg 在 Windows 不存在,raising=False 允许注入以测 POSIX 分支
+    monkeypatch.setattr(launcher.os, "getpgid", lambda pid: 999, raising=False)
+    monkeypatch.setattr(
+        launcher.os,
+        "killpg",
+        lambda pgid, sig: killed.__setitem__("args", (pgid, sig)),
+        raising=False,
+    )
+
+    class FakeProc:
+        pid = 123
+
+    launcher._send_shutdown(FakeProc())
+    assert killed["args"] == (999, _sig.SIGTERM)
+
+
+def test_send_shutdown_missing_process_is_silent(monkeypatch):
+    from llm_manager import launcher
+
+    monkeypatch.setattr(launcher.os, "name", "posix")
+
+    def _raise_ple(pid):
+        raise ProcessLookupError()
+
+    # getpgid 抛 ProcessLookupError → 应被 _send_shutdown 吞掉。
+    # killpg 仅作占位使其属性可解析(实际不会被调用:getpgid 先抛)。
+    monkeypatch.setattr(launcher.os, "getpgid", _raise_ple, raising=False)
+    monkeypatch.setattr(launcher.os, "killpg", lambda *a: None, raising=False)
+
+    class FakeProc:
+        pid = 123
+
+    launcher._send_shutdown(FakeProc())  # 不抛
+
+
+def test_force_kill_when_still_running():
+    from llm_manager import launcher
+
+    killed = {}
+
+    class FakeProc:
+        def poll(self):
+            return None  # 仍运行
+
+        def kill(self):
+            killed["killed"] = True
+
+    launcher._force_kill(FakeProc())
+    assert killed.get("killed") is True
+
+
+def test_force_kill_noop_when_exited():
+    from llm_manager import launcher
+
+    class FakeProc:
+        def poll(self):
+            return 0  # 已退出
+
+        def kill(self):
+            raise AssertionError("不应 kill 已退出的进程")
+
+    launcher._force_kill(FakeProc())
+
+
+# ---------- 入口分派(Task 3) ----------
+
+
+def test_main_dispatches_to_worker_when_flag(monkeypatch):
+    from llm_manager import launcher
+
+    called = {}
+    monkeypatch.setattr(launcher, "_run_worker", lambda: called.__setitem__("w", True))
+    monkeypatch.setattr(launcher, "_run_parent", lambda: called.__setitem__("p", True))
+    monkeypatch.setattr(launcher.sys, "argv", ["llm_manager", "--worker"])
+    launcher.main()
+    assert called == {"w": True}
+
+
+def test_main_dispatches_to_parent_by_default(monkeypatch):
+    from llm_manager import launcher
+
+    called = {}
+    monkeypatch.setattr(launcher, "_run_worker", lambda: called.__setitem__("w", True))
+    monkeypatch.setattr(launcher, "_run_parent", lambda: called.__setitem__("p", True))
+    monkeypatch.setattr(launcher.sys, "argv", ["llm_manager"])
+    launcher.main()
+    assert called == {"p": True}
+
+
+def test_parent_import_does_not_pull_app_stack():
+    """parent 只导入 launcher:FastAPI/httpx 应用栈不进 sys.modules(留给 worker 按需导入)。"""
+    import subprocess
+
+    code = (
+        "import sys, llm_manager.__main__; "
+        "print(sorted(m for m in ('fastapi', 'httpx', 'llm_manager.app') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
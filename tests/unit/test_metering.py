@@ -86,3 +86,35 @@ def test_generic_fallback_error_body_returns_zero():
     assert parse_tokens("v1/whatever", b'{"error":{"message":"bad request"}}') == TokenUsage(
         0, 0, 0, 0
     )
+
+
+def test_iter_blocks_reversed_matches_forward_order():
+    from llm_manager.data.metering import iter_blocks, iter_blocks_reversed
+
+    s = b'data: {"a":1}\r\n\r\ndata: {"a":2}\rdata: [DONE]\n\ndata: {"a":3}'
+    assert list(iter_blocks_reversed(s)) == list(reversed(list(iter_blocks(s))))
+
+
+def test_parse_openai_stream_usage_in_last_frame():
+    frames = b"".join(b'data: {"choices":[{"delta":{"content":"x"}}]}\n\n' for _ in range(500))
+    body = (
+        frames
+        + b'data: {"choices":[],"usage":{"prompt_tokens":7,"completion_tokens":500}}\n\n'
+        + b"data: [DONE]\n\n"
+    )
+    assert parse_tokens("v1/chat/completions", body) == TokenUsage(7, 500, 0, 7)
+
+
+def test_sse_content_frames_are_not_json_parsed(monkeypatch):
+    from llm_manager.data import metering
+
+    parsed = []
+    real = metering.json.loads
+    monkeypatch.setattr(metering.json, "loads", lambda s: (parsed.append(s), real(s))[1])
+    body = (
+        b'data: {"choices":[{"delta":{"content":"x"}}]}\n\n' * 50
+        + b'data: {"choices":[{"delta":{"content":"y"}}]}\n\n'
+        + b"data: [DONE]\n\n"
+    )
+    assert parse_tokens("v1/chat/completions", body) == TokenUsage(0, 0, 0, 0)
+    assert parsed == []  # 无用量键的内容帧只做子串预筛
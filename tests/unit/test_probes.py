@@ -42,3 +42,22 @@ def test_probe_returns_failure_when_shallow_never_succeeds(monkeypatch):
     result = probes.probe_chat("alias", 9999, timeout=0.5)
     assert result.ok is False
     client.close()
+
+
+def test_probe_cancel_interrupts_retry_wait(monkeypatch):
+    import threading
+    import time
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    client = httpx.Client(
+        base_url="http://127.0.0.1:9999/v1", transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(probes, "_make_client", lambda port: client)
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    t0 = time.monotonic()
+    result = probes.probe_chat("alias", 9999, timeout=60, cancel=cancel)
+    assert result.ok is False and "取消" in result.message
+    assert time.monotonic() - t0 < 1.5  # 未等满 2s 轮询间隔,更未等到 60s 预算
@@ -54,6 +54,18 @@ async def test_unsubscribe_unknown_queue_is_safe() -> None:
     assert bc.subscriber_count == 0
 
 
+async def test_publish_snapshot_unaffected_by_subscribe_during_fanout() -> None:
+    bc: Broadcaster[str] = Broadcaster()
+    q1 = bc.subscribe()
+    snap = bc._subs
+    q2 = bc.subscribe()  # copy-on-write: a new set is published, old snapshot intact
+    assert q2 not in snap and q1 in snap
+    bc.unsubscribe(q1)
+    assert q1 in snap and bc.subscriber_count == 1
+    bc.publish("x")
+    assert q1.empty() and q2.get_nowait() == "x"
+
+
 # --------------------------------------------------------------------------- #
 # DeviceFeed (periodic refresh loop)
 # --------------------------------------------------------------------------- #
@@ -173,3 +185,43 @@ async def test_modelfeed_loop_stops_when_last_subscriber_leaves() -> None:
     mid = calls["n"]
     await asyncio.sleep(0.06)
     assert calls["n"] == mid  # snapshot fn no longer called → loop stopped
+
+
+async def test_modelfeed_revision_gates_snapshot_rebuild() -> None:
+    calls = {"n": 0}
+    base = _ChangingSnap()
+    rev = {"r": 0}
+
+    def snap() -> dict:
+        calls["n"] += 1
+        return base()
+
+    feed = ModelFeed(snap, interval=0.01, revision=lambda: rev["r"])
+    q = feed.subscribe()
+    await asyncio.wait_for(q.get(), timeout=1)
+    await asyncio.sleep(0.06)  # revision unchanged → snapshot never rebuilt
+    assert calls["n"] == 1
+    base.set(3)
+    rev["r"] += 1
+    assert await asyncio.wait_for(q.get(), timeout=1) == {"v": 3}
+    assert calls["n"] == 2
+    feed.unsubscribe(q)
+
+
+async def test_modelfeed_current_snapshot_reuses_last_build_while_revision_unchanged() -> None:
+    calls = {"n": 0}
+    base = _ChangingSnap()
+    rev = {"r": 0}
+
+    def snap() -> dict:
+        calls["n"] += 1
+        return base()
+
+    feed = ModelFeed(snap, interval=0.01, revision=lambda: rev["r"])
+    q = feed.subscribe()
+    await asyncio.wait_for(q.get(), timeout=1)
+    assert feed.current_snapshot() == {"v": 0} and calls["n"] == 1  # 复用,未重建
+    base.set(5)
+    rev["r"] += 1
+    assert feed.current_snapshot() == {"v": 5}  # 修订号已变 → 现建
+    feed.unsubscribe(q)
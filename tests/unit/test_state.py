@@ -16,6 +16,8 @@ from llm_manager.state import (
     is_runnable,
     pending_count,
     record_failure,
+    record_pid,
+    revision,
     set_status,
 )
 
@@ -327,3 +329,17 @@ def test_touch_activity_updates_last_access_wall():
     wall1 = state.get_last_access_wall("m1")
     state.touch_activity("m1")
     assert state.get_last_access_wall("m1") >= wall1
+
+
+def test_revision_bumps_on_writes_not_reads():
+    r0 = revision()
+    get_status("m")
+    pending_count("m")
+    assert revision() == r0  # 只读不动修订号
+    begin_request("m")
+    r1 = revision()
+    assert r1 > r0
+    end_request("m")
+    set_status("m", ModelStatus.STARTING)
+    record_pid("m", 1)
+    assert revision() > r1
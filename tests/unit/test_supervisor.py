@@ -1,6 +1,8 @@
 import asyncio
 import sys
 
+import pytest
+
 from llm_manager.supervisor import ProcessRecord, ProcessRunner, Supervisor
 
 
@@ -28,6 +30,19 @@ def test_alive_unknown_pid_is_false():
     assert sup.alive(99999999) is False
 
 
+def test_alive_owned_process_tracks_wait_returncode():
+    async def main():
+        sup = Supervisor()
+        rec = await sup.spawn([sys.executable, "-c", "import time; time.sleep(0.3)"], shell=False)
+        popen = sup._procs[rec.pid]
+        assert sup.alive(rec.pid) is True
+        await asyncio.to_thread(popen.wait)
+        assert sup.alive(rec.pid) is False  # returncode 已回填 → 快路径判死(无 psutil)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+
+
 def test_on_exit_callback_fires_when_process_exits():
     async def main():
         sup = Supervisor()
@@ -83,42 +98,38 @@ def test_spawn_captures_stdout_and_stderr_via_on_output():
 
 
 def test_natural_exit_cleans_all_tables():
-    """自然退出:_wait 路径清空 _procs/_exit_cbs/_readers/_wait_tasks(修复累积泄漏)。"""
+    """自然退出:_wait 路径清空 _procs/_exit_cbs/_wait_tasks(修复累积泄漏)。"""
 
     async def main():
         sup = Supervisor()
         exited = asyncio.Event()
         proc = await sup.spawn([sys.executable, "-c", "pass"], on_output=lambda _line, _s: None)
-        assert proc.pid in sup._readers
         assert proc.pid in sup._procs
         sup.on_exit(proc.pid, lambda _rc: exited.set())
         await asyncio.wait_for(exited.wait(), timeout=5)
         for _ in range(100):  # _wait 清理在回调后执行,轮询等收敛
-            if not sup._procs and not sup._readers and not sup._wait_tasks:
+            if not sup._procs and not sup._wait_tasks:
                 break
             await asyncio.sleep(0.02)
         assert sup._procs == {}
         assert sup._exit_cbs == {}
-        assert sup._readers == {}
         assert sup._wait_tasks == {}
 
     asyncio.run(main())
 
 
 def test_kill_cleans_all_tables():
-    """kill 路径:kill_tree finally 清空 _procs/_exit_cbs/_readers(修复累积泄漏)。"""
+    """kill 路径:kill_tree finally 清空 _procs/_exit_cbs(修复累积泄漏)。"""
 
     async def main():
         sup = Supervisor()
         proc = await sup.spawn(
             [sys.executable, "-c", "import time; time.sleep(60)"], on_output=lambda _line, _s: None
         )
-        assert proc.pid in sup._readers
         assert proc.pid in sup._procs
         assert await sup.kill_tree(proc.pid)
         assert sup._procs == {}
         assert sup._exit_cbs == {}
-        assert sup._readers == {}
 
     asyncio.run(main())
 
@@ -137,6 +148,150 @@ def test_fast_kill_does_not_leak_wait_tasks():
             await asyncio.sleep(0.02)
         assert sup._wait_tasks == {}
         assert sup._procs == {}
-        assert sup._readers == {}
+
+    asyncio.run(main())
+
+
+def test_on_exit_reports_exit_code_with_and_without_pidfd(monkeypatch):
+    import os
+
+    async def run_once():
+        sup = Supervisor()
+        seen = []
+        rec = await sup.spawn([sys.executable, "-c", "raise SystemExit(3)"], shell=False)
+        sup.on_exit(rec.pid, seen.append)
+        await asyncio.wait_for(sup._wait_tasks[rec.pid], 10)
+        return seen
+
+    assert asyncio.run(run_once()) == [3]  # Linux:pidfd 路径
+    monkeypatch.delattr(os, "pidfd_open", raising=False)
+    assert asyncio.run(run_once()) == [3]  # 回退 to_thread(popen.wait)
+
+
+def test_psutil_handle_cached_at_spawn_and_dropped_on_exit():
+    async def main():
+        sup = Supervisor()
+        rec = await sup.spawn([sys.executable, "-c", "import time; time.sleep(5)"], shell=False)
+        cached = sup._ps[rec.pid]
+        assert cached.pid == rec.pid
+        assert await sup.kill_tree(rec.pid) is True
+        await asyncio.sleep(0.2)
+        assert rec.pid not in sup._ps
+
+    asyncio.run(main())
+
+
+def test_kill_tree_prefers_job_object_when_attached(monkeypatch):
+    import psutil
+
+    from llm_manager import supervisor as sup_mod
+
+    terminated = []
+
+    async def main():
+        sup = Supervisor()
+        rec = await sup.spawn([sys.executable, "-c", "import time; time.sleep(30)"], shell=False)
+        leader = sup._ps[rec.pid]
+
+        def fake_terminate(job):  # 模拟 TerminateJobObject:记录句柄并杀掉 job 内进程
+            terminated.append(job)
+            leader.kill()
+            return True
+
+        monkeypatch.setattr(sup_mod, "_terminate_job", fake_terminate)
+        sup._jobs[rec.pid] = 77
+        assert await sup.kill_tree(rec.pid) is True
+        assert terminated == [77]
+        assert rec.pid not in sup._jobs
+        # 返回 True 时 job 内进程已退出(至多余僵尸待 _wait 回收),未走 psutil 回退
+        assert not leader.is_running() or leader.status() == psutil.STATUS_ZOMBIE
+
+    asyncio.run(main())
+
+
+def test_kill_tree_job_falls_back_when_tree_outlives_terminate(monkeypatch):
+    from llm_manager import supervisor as sup_mod
+
+    monkeypatch.setattr(sup_mod, "_terminate_job", lambda job: True)  # 报成功但未杀任何进程
+
+    async def fast_wait_gone(procs, timeout):
+        return await real_wait_gone(procs, min(timeout, 0.2))
+
+    real_wait_gone = sup_mod._wait_gone
+    monkeypatch.setattr(sup_mod, "_wait_gone", fast_wait_gone)
+
+    async def main():
+        sup = Supervisor()
+        rec = await sup.spawn([sys.executable, "-c", "import time; time.sleep(30)"], shell=False)
+        leader = sup._ps[rec.pid]
+        sup._jobs[rec.pid] = 77
+        assert await sup.kill_tree(rec.pid) is True  # 等待超时 → 回退路径真正杀掉
+        assert not leader.is_running() or leader.status() == sup_mod.psutil.STATUS_ZOMBIE
+
+    asyncio.run(main())
+
+
+def test_wait_gone_does_not_block_loop_with_and_without_pidfd(monkeypatch):
+    import os
+
+    import psutil
+
+    from llm_manager.supervisor import _wait_gone
+
+    async def run_once():
+        sup = Supervisor()
+        rec = await sup.spawn([sys.executable, "-c", "import time; time.sleep(30)"], shell=False)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        t = asyncio.create_task(ticker())
+        gone = await _wait_gone([psutil.Process(rec.pid)], timeout=0.3)
+        t.cancel()
+        assert await sup.kill_tree(rec.pid) is True
+        return gone, ticks
+
+    gone, ticks = asyncio.run(run_once())
+    assert gone is False and ticks > 5  # pidfd 路径:超时返回 False,期间事件循环照常运转
+    monkeypatch.delattr(os, "pidfd_open", raising=False)
+    gone, ticks = asyncio.run(run_once())
+    assert gone is False and ticks > 5  # 回退 to_thread(psutil.wait_procs)
+
+
+def test_kill_tree_posix_waits_for_group_and_kills_escaped_descendants():
+    import psutil
+
+    if sys.platform == "win32":
+        pytest.skip("POSIX process groups")
+    code = (
+        "import subprocess, sys, time; "
+        "c = [sys.executable, '-c', 'import time; time.sleep(30)']; "
+        "a = subprocess.Popen(c); b = subprocess.Popen(c, start_new_session=True); "
+        "print(a.pid, b.pid, flush=True); time.sleep(30)"
+    )
+
+    def dead(p):
+        return not p.is_running() or p.status() == psutil.STATUS_ZOMBIE
+
+    async def main():
+        sup = Supervisor()
+        lines: list[str] = []
+        rec = await sup.spawn(
+            [sys.executable, "-c", code], shell=False, on_output=lambda ln, _s: lines.append(ln)
+        )
+        for _ in range(200):
+            if lines:
+                break
+            await asyncio.sleep(0.05)
+        in_group, escaped = (psutil.Process(int(x)) for x in lines[0].split())
+        assert await sup.kill_tree(rec.pid) is True
+        # 返回 True 即全树已退出:组内孙进程无需再等;setsid 脱组者也被逐个补杀
+        assert dead(in_group)
+        psutil.wait_procs([escaped], timeout=3)
+        assert dead(escaped)
 
     asyncio.run(main())
@@ -1,4 +1,5 @@
 import json
+from pathlib import Path
 
 from llm_manager.tray.claude import apply_preset, detect_current_preset
 
@@ -73,3 +74,21 @@ def test_detect_current_preset_unknown_fallback(tmp_path):
     assert detect_current_preset(p, _PRESETS) == "(未知)"
     # 文件缺失也回退
     assert detect_current_preset(tmp_path / "nope.json", _PRESETS) == "(未知)"
+
+
+def test_detect_current_preset_reparses_only_when_file_changes(tmp_path, monkeypatch):
+    p = tmp_path / "settings.json"
+    p.write_text(
+        json.dumps({"env": {"ANTHROPIC_BASE_URL": "http://127.0.0.1:8080"}}), encoding="utf-8"
+    )
+    reads = []
+    real_read = Path.read_text
+    monkeypatch.setattr(
+        Path, "read_text", lambda self, **kw: reads.append(1) or real_read(self, **kw)
+    )
+    for _ in range(5):  # 菜单每次渲染逐项 checked → 未变更时只 stat
+        assert detect_current_preset(p, _PRESETS) == "Local"
+    assert len(reads) == 1
+    apply_preset(p, _PRESETS["GLM"])
+    assert detect_current_preset(p, _PRESETS) == "GLM"
+    assert len(reads) == 3  # apply_preset 读一次 + 失效后重新解析一次